@@ -605,7 +605,7 @@ class AdminCog(commands.Cog):
                     await self.bot.handle_auction_end(auction)
                     processed += 1
                 except Exception as e:
-                    print(f"Error processing expired auction {auction.auction_id}: {e}")
+                    logger.error(f"Error processing expired auction {auction.auction_id}: {e}")
             
             embed = discord.Embed(
                 title="🧹 Cleanup Complete",
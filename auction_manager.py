@@ -2,9 +2,30 @@ import aiosqlite
 import json
 import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from dataclasses import dataclass, asdict
 
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS auctions (
+    auction_id TEXT PRIMARY KEY,
+    owner_id INTEGER NOT NULL,
+    item_name TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    auction_name TEXT NOT NULL,
+    description TEXT,
+    bin_price REAL,
+    current_bid REAL DEFAULT 0,
+    current_bidder_id INTEGER,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    duration_hours INTEGER NOT NULL,
+    image_url TEXT,
+    status TEXT DEFAULT 'active'
+);
+CREATE INDEX IF NOT EXISTS idx_auctions_status_end_time ON auctions(status, end_time);
+"""
+
+
 @dataclass
 class Auction:
     auction_id: str
@@ -22,6 +43,12 @@ class Auction:
     image_url: Optional[str]
     status: str  # 'active', 'ended', 'withdrawn'
     
+    # Render caches for end_time, recomputed whenever end_time is reassigned.
+    # Unannotated, so dataclass leaves them out of fields, __eq__ and asdict().
+    _end_epoch_source = None
+    _end_epoch = 0
+    _end_relative_str = ""
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert auction to dictionary for JSON serialization"""
         data = asdict(self)
@@ -36,6 +63,25 @@ class Auction:
         data['end_time'] = datetime.fromisoformat(data['end_time'])
         return cls(**data)
     
+    def _refresh_end_cache(self):
+        """Recompute the cached end_time renderings if end_time has changed"""
+        if self._end_epoch_source is not self.end_time:
+            self._end_epoch = int(self.end_time.timestamp())
+            self._end_relative_str = f"<t:{self._end_epoch}:R>"
+            self._end_epoch_source = self.end_time
+    
+    @property
+    def end_epoch(self) -> int:
+        """Unix timestamp of end_time"""
+        self._refresh_end_cache()
+        return self._end_epoch
+    
+    @property
+    def end_relative_str(self) -> str:
+        """Discord relative timestamp markup for end_time"""
+        self._refresh_end_cache()
+        return self._end_relative_str
+    
     def is_expired(self) -> bool:
         """Check if auction has expired"""
         return datetime.now() >= self.end_time
@@ -60,28 +106,18 @@ class Auction:
 class AuctionManager:
     def __init__(self, db_path: str = "auctions.db"):
         self.db_path = db_path
+        # "file:" paths are SQLite URIs (e.g. a shared in-memory database)
+        self._uri = db_path.startswith("file:")
+    
+    def connect(self) -> aiosqlite.Connection:
+        """Open a connection to the auction database"""
+        return aiosqlite.connect(self.db_path, uri=self._uri)
         
     async def initialize(self):
         """Initialize the database"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS auctions (
-                    auction_id TEXT PRIMARY KEY,
-                    owner_id INTEGER NOT NULL,
-                    item_name TEXT NOT NULL,
-                    quantity INTEGER NOT NULL,
-                    auction_name TEXT NOT NULL,
-                    description TEXT,
-                    bin_price REAL,
-                    current_bid REAL DEFAULT 0,
-                    current_bidder_id INTEGER,
-                    start_time TEXT NOT NULL,
-                    end_time TEXT NOT NULL,
-                    duration_hours INTEGER NOT NULL,
-                    image_url TEXT,
-                    status TEXT DEFAULT 'active'
-                )
-            """)
+        async with self.connect() as db:
+            # All DDL in one script: a single parse instead of a round-trip per statement
+            await db.executescript(_SCHEMA_SQL)
             await db.commit()
     
     async def create_auction(self, owner_id: int, item_name: str, quantity: int, 
@@ -113,7 +149,7 @@ class AuctionManager:
             status='active'
         )
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             await db.execute("""
                 INSERT INTO auctions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
@@ -129,7 +165,7 @@ class AuctionManager:
     
     async def get_auction(self, auction_id: str) -> Optional[Auction]:
         """Get auction by ID"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             async with db.execute("SELECT * FROM auctions WHERE auction_id = ?", (auction_id,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
@@ -138,7 +174,7 @@ class AuctionManager:
     
     async def get_active_auctions(self, limit: int = 10, offset: int = 0) -> List[Auction]:
         """Get active auctions with pagination"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             async with db.execute(
                 "SELECT * FROM auctions WHERE status = 'active' ORDER BY start_time DESC LIMIT ? OFFSET ?",
                 (limit, offset)
@@ -148,7 +184,7 @@ class AuctionManager:
     
     async def get_user_auctions(self, user_id: int) -> List[Auction]:
         """Get all auctions for a user"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             async with db.execute(
                 "SELECT * FROM auctions WHERE owner_id = ? AND status = 'active' ORDER BY start_time DESC",
                 (user_id,)
@@ -158,7 +194,7 @@ class AuctionManager:
     
     async def update_auction_bid(self, auction_id: str, new_bid: float, bidder_id: int) -> bool:
         """Update auction bid"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             await db.execute("""
                 UPDATE auctions SET current_bid = ?, current_bidder_id = ?
                 WHERE auction_id = ?
@@ -168,7 +204,7 @@ class AuctionManager:
     
     async def update_auction_details(self, auction_id: str, auction_name: str, description: str) -> bool:
         """Update auction name and description"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             await db.execute("""
                 UPDATE auctions SET auction_name = ?, description = ?
                 WHERE auction_id = ?
@@ -182,7 +218,7 @@ class AuctionManager:
         if not auction or auction.owner_id != user_id:
             return False
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             await db.execute("""
                 UPDATE auctions SET status = 'withdrawn'
                 WHERE auction_id = ?
@@ -192,7 +228,7 @@ class AuctionManager:
     
     async def end_auction(self, auction_id: str) -> bool:
         """End an auction"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             await db.execute("""
                 UPDATE auctions SET status = 'ended'
                 WHERE auction_id = ?
@@ -202,13 +238,13 @@ class AuctionManager:
     
     async def remove_auction(self, auction_id: str):
         """Remove auction from database"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             await db.execute("DELETE FROM auctions WHERE auction_id = ?", (auction_id,))
             await db.commit()
     
     async def get_user_auction_count(self, user_id: int) -> int:
         """Get count of active auctions for a user"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             async with db.execute(
                 "SELECT COUNT(*) FROM auctions WHERE owner_id = ? AND status = 'active'",
                 (user_id,)
@@ -219,7 +255,7 @@ class AuctionManager:
     async def get_user_recent_auctions(self, user_id: int, hours: int = 24) -> List[Auction]:
         """Get user's recent auctions within specified hours"""
         cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             async with db.execute(
                 "SELECT * FROM auctions WHERE owner_id = ? AND start_time >= ? ORDER BY start_time DESC",
                 (user_id, cutoff_time)
@@ -229,7 +265,7 @@ class AuctionManager:
     
     async def get_auction_statistics(self) -> dict:
         """Get comprehensive auction statistics"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             stats = {}
             
             # Count by status
@@ -262,7 +298,7 @@ class AuctionManager:
     
     async def force_end_auction(self, auction_id: str, reason: str = "Administrative action") -> bool:
         """Force end an auction with admin reason"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             await db.execute(
                 "UPDATE auctions SET status = 'ended' WHERE auction_id = ?",
                 (auction_id,)
@@ -279,7 +315,7 @@ class AuctionManager:
         new_end_time = auction.end_time + timedelta(hours=additional_hours)
         new_duration = auction.duration_hours + additional_hours
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             await db.execute(
                 "UPDATE auctions SET end_time = ?, duration_hours = ? WHERE auction_id = ?",
                 (new_end_time.isoformat(), new_duration, auction_id)
@@ -290,7 +326,7 @@ class AuctionManager:
     async def get_expired_auctions(self) -> List[Auction]:
         """Get all expired active auctions"""
         current_time = datetime.now().isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.connect() as db:
             async with db.execute(
                 "SELECT * FROM auctions WHERE status = 'active' AND end_time <= ?",
                 (current_time,)
@@ -298,6 +334,32 @@ class AuctionManager:
                 rows = await cursor.fetchall()
                 return [self._row_to_auction(row) for row in rows]
     
+    async def get_auctions_ending_between(self, start: datetime, end: datetime) -> List[Auction]:
+        """Get active auctions whose end time falls within [start, end]"""
+        async with self.connect() as db:
+            async with db.execute(
+                "SELECT * FROM auctions WHERE status = 'active' AND end_time BETWEEN ? AND ? ORDER BY end_time",
+                (start.isoformat(), end.isoformat())
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return [self._row_to_auction(row) for row in rows]
+    
+    async def get_soonest_ending_auctions(self, limit: int = 10) -> Tuple[List[Auction], int]:
+        """Get the active auctions ending soonest along with the total number of active auctions"""
+        async with self.connect() as db:
+            # Walks idx_auctions_status_end_time in order, so only `limit` rows are read
+            async with db.execute(
+                "SELECT * FROM auctions WHERE status = 'active' ORDER BY end_time LIMIT ?",
+                (limit,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+            
+            async with db.execute("SELECT COUNT(*) FROM auctions WHERE status = 'active'") as cursor:
+                result = await cursor.fetchone()
+                total = result[0] if result else 0
+            
+            return [self._row_to_auction(row) for row in rows], total
+    
     def _row_to_auction(self, row) -> Auction:
         """Convert database row to Auction object"""
         return Auction(
@@ -8,10 +8,10 @@ from typing import Optional, Dict, Any
 from dataclasses import dataclass
 
 from config import config
-from monitoring import logger, metrics_collector, get_performance_timer
+from monitoring import logger, metrics_collector, get_performance_timer, DATACLASS_SLOTS
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class BidSnipingEvent:
     """Data structure for bid sniping events"""
     auction_id: str
@@ -142,9 +142,7 @@ class BidSnipingProtector:
     async def _update_auction_end_time(self, auction_id: str, new_end_time: datetime, new_duration: float) -> bool:
         """Update auction end time in database"""
         try:
-            import aiosqlite
-            
-            async with aiosqlite.connect(self.auction_manager.db_path) as db:
+            async with self.auction_manager.connect() as db:
                 await db.execute(
                     "UPDATE auctions SET end_time = ?, duration_hours = ? WHERE auction_id = ?",
                     (new_end_time.isoformat(), new_duration, auction_id)
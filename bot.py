@@ -54,6 +54,11 @@ class BCTCAuctionBot(commands.Bot):
                 task.cancel()
                 logger.info("✅ Background tasks stopped")
         
+        # Close the notification preferences connection
+        notification_preferences = getattr(self, 'notification_preferences', None)
+        if notification_preferences:
+            await notification_preferences.close()
+        
         # Close auction manager connections if needed
         if self.auction_manager:
             # Add any cleanup for auction manager if needed
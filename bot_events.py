@@ -133,8 +133,8 @@ class BotEvents:
             
             # Update pinned auction list
             if self.notification_service:
-                active_auctions = await self.auction_manager.get_active_auctions(limit=50)  # Get more for pinned list
-                await self.notification_service.update_pinned_auction_list(active_auctions)
+                soonest_auctions, total_active = await self.auction_manager.get_soonest_ending_auctions()
+                await self.notification_service.update_pinned_auction_list(soonest_auctions, total_active)
             
             # Cleanup old bid sniping records
             if self.bid_sniping_protector:
@@ -66,12 +66,15 @@ class BotConfig:
     LOG_FILE = 'bot.log'
     LOG_MAX_SIZE_MB = 10
     LOG_BACKUP_COUNT = 5
+    LOG_ROLLOVER_CHECK_INTERVAL = 50  # Records between log file size checks
+    DISCORD_LOG_MIN_LEVEL = 'WARNING'  # Lowest level shipped to the Discord log channel
     
     # Console encoding handling for Windows emoji support
     CONSOLE_ENCODING_UTF8 = True
     
     # Monitoring Configuration
-    METRICS_ENABLED = True
+    # Read at import time: monitoring picks its collector implementation when first imported
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('true', '1', 'yes', 'on')
     METRICS_COLLECTION_INTERVAL = 60  # seconds
     PERFORMANCE_ALERT_THRESHOLDS = {
         'response_time_ms': 5000,
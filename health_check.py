@@ -70,6 +70,7 @@ class HealthCheckManager:
     async def start_health_monitoring(self):
         """Start the health monitoring background task"""
         if not self.health_check_task.is_running():
+            await self.health_checker.start()
             self.health_check_task.start()
             logger.info("Health monitoring started")
     
@@ -77,6 +78,7 @@ class HealthCheckManager:
         """Stop the health monitoring background task"""
         if self.health_check_task.is_running():
             self.health_check_task.cancel()
+            await self.health_checker.stop()
             logger.info("Health monitoring stopped")
     
     @tasks.loop(minutes=config.HEALTH_CHECK_INTERVAL_MINUTES)
@@ -97,8 +99,8 @@ class HealthCheckManager:
         """Run all health checks and process results"""
         logger.debug("Running comprehensive health check")
         
-        # Run standard health checks
-        health_results = await self.health_checker.run_all_checks()
+        # Run standard health checks; results younger than the checker's TTL are reused
+        health_results = await self.health_checker.run_all_checks(force=True)
         
         # Add custom health checks
         custom_checks = await self._run_custom_health_checks()
@@ -3,23 +3,58 @@ Monitoring and logging system for BCTC Auction Bot
 Provides structured logging, metrics collection, and health monitoring
 """
 import asyncio
+import atexit
+import heapq
 import json
 import logging
 import logging.handlers
+import re
 import time
 import psutil
+import queue
 import discord
 import sys
 import os
+from array import array
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass, asdict
-from collections import defaultdict, deque
+from collections import deque
 
 from config import config
 
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        """Serialize log data with orjson when it is installed"""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    _dumps = json.dumps
+
+
+# Numeric ranks used to filter Discord log shipping by level
+_LEVEL_RANK = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+
+# Embed colors for Discord log messages by level
+_COLOR_MAP = {
+    'ERROR': 0xff0000,
+    'WARNING': 0xffaa00,
+    'INFO': 0x0099ff,
+    'DEBUG': 0x808080
+}
+
+# Discord rejects embeds over 6000 characters in total; keep room for the footer
+_EMBED_FIELD_BUDGET = 6000 - 100
+
+# Shared tags value for exported samples without tags; never mutate it
+_EMPTY_TAGS: Dict[str, str] = {}
+
+# dataclass(slots=True) is only available on Python 3.10+
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class MetricData:
     """Data structure for storing metrics"""
     timestamp: datetime
@@ -32,11 +67,11 @@ class MetricData:
             'timestamp': self.timestamp.isoformat(),
             'metric_name': self.metric_name,
             'value': self.value,
-            'tags': self.tags or {}
+            'tags': self.tags if self.tags is not None else _EMPTY_TAGS
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class HealthStatus:
     """Health check status"""
     service_name: str
@@ -49,85 +84,194 @@ class HealthStatus:
         return asdict(self)
 
 
+# Roles a metric can play in MetricsCollector
+_COUNTER, _GAUGE, _TIMER = 0, 1, 2
+
+
+class _RingMetric:
+    """Fixed-capacity ring buffer holding the recent samples of one metric.
+    
+    Timestamps (epoch nanoseconds) and values live in two preallocated arrays
+    so recording a sample does not allocate; tags are kept in a sparse dict
+    keyed by slot. The arrays are only allocated once a sample is pushed, so
+    counters and gauges that never record a time series cost nothing extra.
+    The aggregate for the metric's role (counter total, last gauge value or
+    recent timer values) is tracked alongside.
+    """
+    __slots__ = ('kind', 'counter_sum', 'gauge_last', 'recent',
+                 'capacity', 'ts', 'val', 'tags', 'head', 'count')
+    
+    def __init__(self, kind: int, capacity: int = 1000):
+        self.kind = kind
+        self.counter_sum = 0
+        self.gauge_last = 0.0
+        # Only the last 100 timer values feed the summary
+        self.recent: Optional[deque] = deque(maxlen=100) if kind == _TIMER else None
+        self.capacity = capacity
+        self.ts: Optional[array] = None
+        self.val: Optional[array] = None
+        self.tags: Dict[int, Dict[str, str]] = {}
+        self.head = 0
+        self.count = 0
+    
+    def push(self, value: float, tags: Optional[Dict[str, str]] = None):
+        """Record a sample, overwriting the oldest one when full"""
+        if self.ts is None:
+            self.ts = array('q', bytes(8 * self.capacity))
+            self.val = array('d', bytes(8 * self.capacity))
+        i = self.head
+        self.ts[i] = time.time_ns()
+        self.val[i] = value
+        if tags is not None:
+            self.tags[i] = tags
+        elif self.tags:
+            self.tags.pop(i, None)
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+    
+    def samples(self):
+        """Yield (timestamp_ns, value, tags) tuples, oldest first"""
+        start = (self.head - self.count) % self.capacity
+        for n in range(self.count):
+            i = (start + n) % self.capacity
+            yield self.ts[i], self.val[i], self.tags.get(i)
+
+
 class MetricsCollector:
     """Collects and stores performance metrics"""
     
     def __init__(self):
-        self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
-        self.counters: Dict[str, int] = defaultdict(int)
-        self.gauges: Dict[str, float] = defaultdict(float)
-        self.timers: Dict[str, List[float]] = defaultdict(list)
+        self.metrics: Dict[str, _RingMetric] = {}
+    
+    def _new_metric(self, name: str, kind: int) -> _RingMetric:
+        """Create and register the storage for a metric seen for the first time"""
+        ring = self.metrics[name] = _RingMetric(kind)
+        return ring
         
     def record_counter(self, name: str, value: int = 1, tags: Optional[Dict[str, str]] = None):
-        """Record a counter metric"""
-        self.counters[name] += value
-        self.metrics[name].append(MetricData(
-            timestamp=datetime.now(),
-            metric_name=name,
-            value=value,
-            tags=tags
-        ))
+        """Record a counter metric (running total only)"""
+        ring = self.metrics.get(name) or self._new_metric(name, _COUNTER)
+        ring.counter_sum += value
+    
+    def record_counter_ts(self, name: str, value: int = 1, tags: Optional[Dict[str, str]] = None):
+        """Record a counter metric and keep the increment in its time series"""
+        ring = self.metrics.get(name) or self._new_metric(name, _COUNTER)
+        ring.counter_sum += value
+        ring.push(value, tags)
     
     def record_gauge(self, name: str, value: float, tags: Optional[Dict[str, str]] = None):
-        """Record a gauge metric"""
-        self.gauges[name] = value
-        self.metrics[name].append(MetricData(
-            timestamp=datetime.now(),
-            metric_name=name,
-            value=value,
-            tags=tags
-        ))
+        """Record a gauge metric (latest value only)"""
+        ring = self.metrics.get(name) or self._new_metric(name, _GAUGE)
+        ring.gauge_last = value
+    
+    def record_gauge_ts(self, name: str, value: float, tags: Optional[Dict[str, str]] = None):
+        """Record a gauge metric and keep the value in its time series"""
+        ring = self.metrics.get(name) or self._new_metric(name, _GAUGE)
+        ring.gauge_last = value
+        ring.push(value, tags)
     
     def record_timer(self, name: str, duration_ms: float, tags: Optional[Dict[str, str]] = None):
         """Record a timer metric"""
-        self.timers[name].append(duration_ms)
-        # Keep only last 100 timer values
-        if len(self.timers[name]) > 100:
-            self.timers[name] = self.timers[name][-100:]
-        
-        self.metrics[name].append(MetricData(
-            timestamp=datetime.now(),
-            metric_name=name,
-            value=duration_ms,
-            tags=tags
-        ))
+        ring = self.metrics.get(name) or self._new_metric(name, _TIMER)
+        if ring.recent is not None:
+            ring.recent.append(duration_ms)
+        ring.push(duration_ms, tags)
+    
+    def get_metric_history(self, name: str) -> List[MetricData]:
+        """Get the recorded samples of a metric, oldest first"""
+        ring = self.metrics.get(name)
+        if ring is None:
+            return []
+        return [
+            MetricData(
+                timestamp=datetime.fromtimestamp(ts_ns / 1e9),
+                metric_name=name,
+                value=value,
+                tags=tags
+            )
+            for ts_ns, value, tags in ring.samples()
+        ]
     
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get summary of all metrics"""
         summary = {
-            'counters': dict(self.counters),
-            'gauges': dict(self.gauges),
+            'counters': {},
+            'gauges': {},
             'timers': {}
         }
         
-        for name, values in self.timers.items():
-            if values:
+        for name, ring in self.metrics.items():
+            if ring.kind == _COUNTER:
+                summary['counters'][name] = ring.counter_sum
+            elif ring.kind == _GAUGE:
+                summary['gauges'][name] = ring.gauge_last
+            elif ring.recent:
+                values = list(ring.recent)
+                count = len(values)
+                max_value = max(values)
+                if count > 20:
+                    # Only the top 5% needs ordering: the p95 sample is the
+                    # smallest of the (count - index) largest values
+                    p95 = heapq.nlargest(count - int(count * 0.95), values)[-1]
+                else:
+                    p95 = max_value
                 summary['timers'][name] = {
-                    'count': len(values),
-                    'avg': sum(values) / len(values),
+                    'count': count,
+                    'avg': sum(values) / count,
                     'min': min(values),
-                    'max': max(values),
-                    'p95': sorted(values)[int(len(values) * 0.95)] if len(values) > 20 else max(values)
+                    'max': max_value,
+                    'p95': p95
                 }
         
         return summary
 
 
+class NullMetricsCollector:
+    """No-op metrics collector used when METRICS_ENABLED is off"""
+    
+    def record_counter(self, *args, **kwargs):
+        pass
+    
+    record_counter_ts = record_counter
+    record_gauge = record_counter
+    record_gauge_ts = record_counter
+    record_timer = record_counter
+    
+    def get_metric_history(self, name: str) -> List[MetricData]:
+        """Return no samples, since nothing is recorded"""
+        return []
+    
+    def get_metrics_summary(self) -> Dict[str, Any]:
+        """Return an empty summary with the same shape as MetricsCollector"""
+        return {'counters': {}, 'gauges': {}, 'timers': {}}
+
+
 class HealthChecker:
     """Performs health checks on various system components"""
     
     def __init__(self, bot):
         self.bot = bot
         self.health_status: Dict[str, HealthStatus] = {}
+        self._ttl = timedelta(seconds=15)  # How long a check result stays fresh
+        # The background refresh only needs to keep pace with the periodic health task
+        self._refresh_interval = config.HEALTH_CHECK_INTERVAL_MINUTES * 60  # seconds
+        self._check_timeout = 5  # seconds
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._disk_cache = None
+        self._disk_cache_time = 0.0
+        self._disk_cache_ttl = 30  # seconds
+        self._mem_t = config.PERFORMANCE_ALERT_THRESHOLDS['memory_usage_mb']
+        self._cpu_t = config.PERFORMANCE_ALERT_THRESHOLDS['cpu_usage_percent']
         
     async def check_database_health(self) -> HealthStatus:
         """Check database connectivity and performance"""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             if hasattr(self.bot, 'auction_manager') and self.bot.auction_manager:
                 # Simple database query to test connectivity
                 await self.bot.auction_manager.get_active_auctions(limit=1)
-                response_time = (time.time() - start_time) * 1000
+                response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
                 
                 return HealthStatus(
                     service_name="database",
@@ -154,11 +298,11 @@ class HealthChecker:
     
     async def check_discord_api_health(self) -> HealthStatus:
         """Check Discord API connectivity"""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             # Test Discord API with a simple operation
             await self.bot.fetch_user(self.bot.user.id)
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
             
             return HealthStatus(
                 service_name="discord_api",
@@ -176,23 +320,33 @@ class HealthChecker:
                 last_check=datetime.now()
             )
     
+    async def _get_cpu_usage(self) -> float:
+        """Sample CPU usage over one second; only runs when the system check itself is stale"""
+        # cpu_percent(interval=1) sleeps synchronously, so keep it off the event loop
+        return await asyncio.get_running_loop().run_in_executor(None, psutil.cpu_percent, 1)
+    
+    def _get_disk_usage(self):
+        """Get disk usage, refreshed at most every _disk_cache_ttl seconds"""
+        now = time.monotonic()
+        if self._disk_cache is None or now - self._disk_cache_time >= self._disk_cache_ttl:
+            self._disk_cache = psutil.disk_usage('/')
+            self._disk_cache_time = now
+        return self._disk_cache
+    
     async def check_system_resources(self) -> HealthStatus:
         """Check system resource usage"""
         try:
             memory_usage = psutil.virtual_memory()
-            cpu_usage = psutil.cpu_percent(interval=1)
-            disk_usage = psutil.disk_usage('/')
+            cpu_usage = await self._get_cpu_usage()
+            disk_usage = self._get_disk_usage()
             
             memory_mb = memory_usage.used / 1024 / 1024
             disk_free_gb = disk_usage.free / 1024 / 1024 / 1024
             
             # Check against thresholds
-            memory_threshold = config.PERFORMANCE_ALERT_THRESHOLDS['memory_usage_mb']
-            cpu_threshold = config.PERFORMANCE_ALERT_THRESHOLDS['cpu_usage_percent']
-            
             is_healthy = (
-                memory_mb < memory_threshold and 
-                cpu_usage < cpu_threshold and 
+                memory_mb < self._mem_t and 
+                cpu_usage < self._cpu_t and 
                 disk_free_gb > 1.0  # At least 1GB free
             )
             
@@ -213,21 +367,105 @@ class HealthChecker:
                 last_check=datetime.now()
             )
     
-    async def run_all_checks(self) -> Dict[str, HealthStatus]:
-        """Run all health checks"""
-        checks = [
-            self.check_database_health(),
-            self.check_discord_api_health(),
-            self.check_system_resources()
+    async def _run_check_with_timeout(self, check: Callable, service_name: str) -> HealthStatus:
+        """Run a single health check, reporting it unhealthy if it takes too long"""
+        try:
+            return await asyncio.wait_for(check(), timeout=self._check_timeout)
+        except asyncio.TimeoutError:
+            return HealthStatus(
+                service_name=service_name,
+                is_healthy=False,
+                message=f"Health check timed out after {self._check_timeout}s",
+                last_check=datetime.now()
+            )
+    
+    async def _run_checks_once(self):
+        """Run every health check whose cached result is older than the TTL"""
+        checks = {
+            'database': self.check_database_health,
+            'discord_api': self.check_discord_api_health,
+            'system_resources': self.check_system_resources
+        }
+        
+        now = datetime.now()
+        stale_checks = [
+            (service_name, check) for service_name, check in checks.items()
+            if service_name not in self.health_status
+            or now - self.health_status[service_name].last_check >= self._ttl
         ]
         
-        results = await asyncio.gather(*checks, return_exceptions=True)
+        results = await asyncio.gather(
+            *(self._run_check_with_timeout(check, service_name) for service_name, check in stale_checks),
+            return_exceptions=True
+        )
         
         for result in results:
             if isinstance(result, HealthStatus):
                 self.health_status[result.service_name] = result
+    
+    async def _refresh_loop(self):
+        """Background task that keeps health_status fresh"""
+        while True:
+            try:
+                await self._run_checks_once()
+            except Exception as e:
+                logger.error(f"Error refreshing health checks: {e}")
+            await asyncio.sleep(self._refresh_interval)
+    
+    async def start(self):
+        """Start refreshing health checks in the background"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+    
+    async def stop(self):
+        """Stop the background refresh task"""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        self._refresh_task = None
+    
+    async def run_all_checks(self, force: bool = False) -> Dict[str, HealthStatus]:
+        """
+        Get the latest health check results
         
-        return self.health_status
+        Args:
+            force: Re-run every check older than the TTL even while the background refresh is running
+        """
+        if force or self._refresh_task is None or self._refresh_task.done() or not self.health_status:
+            await self._run_checks_once()
+        return dict(self.health_status)
+
+
+class BatchedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that only checks the file size every N records"""
+    
+    def __init__(self, *args, rollover_check_interval: int = 50, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rollover_check_interval = rollover_check_interval
+        self._records_since_check = 0
+    
+    def shouldRollover(self, record) -> bool:
+        # The base check seeks/stats the file on every record; the file may
+        # overshoot maxBytes by at most rollover_check_interval records
+        self._records_since_check += 1
+        if self._records_since_check < self.rollover_check_interval:
+            return False
+        self._records_since_check = 0
+        return super().shouldRollover(record)
+
+
+class SafeConsoleFormatter(logging.Formatter):
+    """Console-only formatter that replaces emojis with text fallbacks.
+    
+    Sanitizing here rather than in a filter leaves the shared LogRecord
+    untouched, so the UTF-8 file handler still writes the original emojis.
+    """
+    
+    def __init__(self, logger_instance: 'StructuredLogger'):
+        super().__init__(config.LOG_FORMAT)
+        self.logger_instance = logger_instance
+    
+    def format(self, record):
+        return self.logger_instance._sanitize_message_for_console(super().format(record))
 
 
 class StructuredLogger:
@@ -235,11 +473,19 @@ class StructuredLogger:
     
     def __init__(self, name: str = "BCTC_Auction"):
         self.logger = logging.getLogger(name)
+        self._listener: Optional[logging.handlers.QueueListener] = None
         self.emoji_fallbacks = self._create_emoji_fallbacks()
+        # Single alternation over all emojis (longest first so multi-codepoint ones win)
+        self._emoji_pattern = re.compile('|'.join(
+            sorted(map(re.escape, self.emoji_fallbacks), key=len, reverse=True)
+        ))
         self.setup_logging()
         self.discord_log_channel: Optional[discord.TextChannel] = None
+        self.discord_min_level = getattr(config, 'DISCORD_LOG_MIN_LEVEL', 'WARNING')
+        self._discord_queue: Optional[asyncio.Queue] = None
+        self._discord_worker: Optional[asyncio.Task] = None
         
-        # Fix console encoding for Windows
+        # Make console output encoding-safe (UTF-8 on Windows)
         self._setup_console_encoding()
     
     def _create_emoji_fallbacks(self) -> Dict[str, str]:
@@ -268,23 +514,25 @@ class StructuredLogger:
         }
     
     def _setup_console_encoding(self):
-        """Setup console encoding to handle Unicode characters"""
-        if sys.platform.startswith('win'):
+        """Setup console streams so writing Unicode can never raise"""
+        for stream in (sys.stdout, sys.stderr):
+            # Streams may be replaced (e.g. by test capture) with objects lacking reconfigure()
+            if not hasattr(stream, 'reconfigure'):
+                continue
             try:
-                # Try to set console to UTF-8 if possible
-                import codecs
-                sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
-                sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
+                if sys.platform.startswith('win') and config.CONSOLE_ENCODING_UTF8:
+                    stream.reconfigure(encoding='utf-8', errors='replace')
+                else:
+                    stream.reconfigure(errors='replace')
             except Exception:
-                # If UTF-8 setup fails, we'll rely on emoji fallbacks
+                # If reconfiguration fails, we'll rely on emoji fallbacks
                 pass
     
     def _sanitize_message_for_console(self, message: str) -> str:
         """Replace emojis with fallback text for console output"""
-        sanitized = message
-        for emoji, fallback in self.emoji_fallbacks.items():
-            sanitized = sanitized.replace(emoji, fallback)
-        return sanitized
+        if message.isascii():
+            return message
+        return self._emoji_pattern.sub(lambda match: self.emoji_fallbacks[match.group()], message)
         
     def setup_logging(self):
         """Configure logging with file rotation and formatting"""
@@ -294,139 +542,155 @@ class StructuredLogger:
         if self.logger.handlers:
             return
         
-        # Custom formatter that handles emojis for console
-        class SafeConsoleFormatter(logging.Formatter):
-            def __init__(self, logger_instance):
-                super().__init__(config.LOG_FORMAT)
-                self.logger_instance = logger_instance
-                
-            def format(self, record):
-                # Get the formatted message
-                formatted = super().format(record)
-                # Sanitize for console output
-                return self.logger_instance._sanitize_message_for_console(formatted)
-            
         # Console handler with emoji-safe formatter
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_formatter = SafeConsoleFormatter(self)
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
         
         # File handler with rotation - uses UTF-8 encoding to preserve emojis
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = BatchedRotatingFileHandler(
             config.LOG_FILE,
             maxBytes=config.LOG_MAX_SIZE_MB * 1024 * 1024,
             backupCount=config.LOG_BACKUP_COUNT,
-            encoding='utf-8'  # Ensure UTF-8 encoding for file output
+            encoding='utf-8',  # Ensure UTF-8 encoding for file output
+            rollover_check_interval=config.LOG_ROLLOVER_CHECK_INTERVAL
         )
         file_handler.setLevel(logging.DEBUG)
         file_formatter = logging.Formatter(config.LOG_FORMAT)
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        
+        # Callers only enqueue records; a listener thread does the console and disk I/O
+        log_queue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self.shutdown)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    def shutdown(self):
+        """Flush queued log records and stop the listener thread"""
+        if self._listener:
+            self._listener.stop()
+            self._listener = None
     
     def set_discord_channel(self, channel: discord.TextChannel):
         """Set Discord channel for log messages"""
         self.discord_log_channel = channel
     
-    async def log_to_discord(self, level: str, message: str, extra_data: Optional[Dict[str, Any]] = None):
-        """Send log messages to Discord channel"""
+    def log_to_discord(self, level: str, message: str, extra_data: Optional[Dict[str, Any]] = None):
+        """Queue a log message for the Discord log channel"""
+        if _LEVEL_RANK.get(level, 0) < _LEVEL_RANK.get(self.discord_min_level, 30):
+            return
         if not self.discord_log_channel:
             return
-            
+        
         try:
-            color_map = {
-                'ERROR': 0xff0000,
-                'WARNING': 0xffaa00,
-                'INFO': 0x0099ff,
-                'DEBUG': 0x808080
-            }
-            
-            embed = discord.Embed(
-                title=f"{level} - BCTC Auction Bot",
-                description=message[:2000],  # Discord limit
-                color=color_map.get(level, 0x0099ff),
-                timestamp=datetime.now()
-            )
-            
-            if extra_data:
-                for key, value in extra_data.items():
-                    embed.add_field(name=key, value=str(value)[:1024], inline=True)
-            
-            await self.discord_log_channel.send(embed=embed)
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop yet (e.g. during startup), nothing can be sent
+            return
+        
+        if self._discord_queue is None:
+            self._discord_queue = asyncio.Queue(maxsize=1000)
+        if self._discord_worker is None or self._discord_worker.done():
+            self._discord_worker = loop.create_task(self._drain_discord_logs())
+        
+        entry = (level, message, extra_data)
+        try:
+            self._discord_queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            # Drop the oldest entry rather than blocking the caller
+            self._discord_queue.get_nowait()
+            self._discord_queue.put_nowait(entry)
+    
+    async def _drain_discord_logs(self):
+        """Background consumer that ships queued log messages to Discord in batches"""
+        while True:
+            batch = [await self._discord_queue.get()]
+            while len(batch) < 10:
+                try:
+                    batch.append(self._discord_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
             
-        except Exception as e:
-            # Don't let Discord logging failures break the application
-            self.logger.error(f"Failed to send log to Discord: {e}")
+            try:
+                if self.discord_log_channel:
+                    await self.discord_log_channel.send(embed=self._create_discord_log_embed(batch))
+            except Exception as e:
+                # Don't let Discord logging failures break the application
+                self.logger.error(f"Failed to send log to Discord: {e}")
+    
+    def _create_discord_log_embed(self, batch: List[tuple]) -> discord.Embed:
+        """Create one embed covering a batch of queued log messages"""
+        level = max((entry[0] for entry in batch), key=lambda lvl: _LEVEL_RANK.get(lvl, 0))
+        single = len(batch) == 1
+        if single:
+            description = batch[0][1][:2000]  # Discord limit
+        else:
+            # Numbered so each entry's data fields can be matched to its line
+            description = "\n".join(
+                f"{index}. **{lvl}**: {msg[:500]}" for index, (lvl, msg, _) in enumerate(batch, 1)
+            )[:4000]
+        
+        embed = discord.Embed(
+            title=f"{level} - BCTC Auction Bot",
+            description=description,
+            color=_COLOR_MAP.get(level, 0x0099ff),
+            timestamp=datetime.now()
+        )
+        
+        # Fields stop at Discord's 25-field or total-length limit; the rest stay in the log file
+        total_length = len(embed)
+        omitted = 0
+        for index, (_, _, extra_data) in enumerate(batch, 1):
+            if not extra_data:
+                continue
+            for key, value in extra_data.items():
+                name = (str(key) if single else f"{index}. {key}")[:256]
+                value = str(value)[:1024]
+                if len(embed.fields) >= 25 or total_length + len(name) + len(value) > _EMBED_FIELD_BUDGET:
+                    omitted += 1
+                    continue
+                embed.add_field(name=name, value=value, inline=True)
+                total_length += len(name) + len(value)
+        
+        if omitted:
+            embed.set_footer(text=f"{omitted} data field(s) omitted, see the log file")
+        
+        return embed
+    
+    def _log(self, level: int, message: str, extra_data: Optional[Dict[str, Any]] = None):
+        """Format and emit a log record, skipping all formatting when the level is disabled"""
+        if not self.logger.isEnabledFor(level):
+            return
+        if extra_data:
+            self.logger.log(level, f"{message} | Data: {_dumps(extra_data)}")
+        else:
+            self.logger.log(level, message)
     
     def info(self, message: str, extra_data: Optional[Dict[str, Any]] = None, discord_log: bool = False):
         """Log info message"""
-        try:
-            if extra_data:
-                self.logger.info(f"{message} | Data: {json.dumps(extra_data)}")
-            else:
-                self.logger.info(message)
-        except UnicodeEncodeError:
-            # Fallback: sanitize the message and try again
-            sanitized_message = self._sanitize_message_for_console(message)
-            if extra_data:
-                self.logger.info(f"{sanitized_message} | Data: {json.dumps(extra_data)}")
-            else:
-                self.logger.info(sanitized_message)
-            
+        self._log(logging.INFO, message, extra_data)
         if discord_log:
-            asyncio.create_task(self.log_to_discord('INFO', message, extra_data))
+            self.log_to_discord('INFO', message, extra_data)
     
     def warning(self, message: str, extra_data: Optional[Dict[str, Any]] = None, discord_log: bool = True):
         """Log warning message"""
-        try:
-            if extra_data:
-                self.logger.warning(f"{message} | Data: {json.dumps(extra_data)}")
-            else:
-                self.logger.warning(message)
-        except UnicodeEncodeError:
-            # Fallback: sanitize the message and try again
-            sanitized_message = self._sanitize_message_for_console(message)
-            if extra_data:
-                self.logger.warning(f"{sanitized_message} | Data: {json.dumps(extra_data)}")
-            else:
-                self.logger.warning(sanitized_message)
-            
+        self._log(logging.WARNING, message, extra_data)
         if discord_log:
-            asyncio.create_task(self.log_to_discord('WARNING', message, extra_data))
+            self.log_to_discord('WARNING', message, extra_data)
     
     def error(self, message: str, extra_data: Optional[Dict[str, Any]] = None, discord_log: bool = True):
         """Log error message"""
-        try:
-            if extra_data:
-                self.logger.error(f"{message} | Data: {json.dumps(extra_data)}")
-            else:
-                self.logger.error(message)
-        except UnicodeEncodeError:
-            # Fallback: sanitize the message and try again
-            sanitized_message = self._sanitize_message_for_console(message)
-            if extra_data:
-                self.logger.error(f"{sanitized_message} | Data: {json.dumps(extra_data)}")
-            else:
-                self.logger.error(sanitized_message)
-            
+        self._log(logging.ERROR, message, extra_data)
         if discord_log:
-            asyncio.create_task(self.log_to_discord('ERROR', message, extra_data))
+            self.log_to_discord('ERROR', message, extra_data)
     
     def debug(self, message: str, extra_data: Optional[Dict[str, Any]] = None):
         """Log debug message"""
-        try:
-            if extra_data:
-                self.logger.debug(f"{message} | Data: {json.dumps(extra_data)}")
-            else:
-                self.logger.debug(message)
-        except UnicodeEncodeError:
-            # Fallback: sanitize the message and try again
-            sanitized_message = self._sanitize_message_for_console(message)
-            if extra_data:
-                self.logger.debug(f"{sanitized_message} | Data: {json.dumps(extra_data)}")
-            else:
-                self.logger.debug(sanitized_message)
+        self._log(logging.DEBUG, message, extra_data)
 
 
 class PerformanceTimer:
@@ -436,30 +700,45 @@ class PerformanceTimer:
         self.operation_name = operation_name
         self.metrics_collector = metrics_collector
         self.logger = logger
-        self.start_time = None
+        self.start_ns: Optional[int] = None
+        self._threshold = config.PERFORMANCE_ALERT_THRESHOLDS['response_time_ms']
     
     def __enter__(self):
-        self.start_time = time.time()
+        # Monotonic integer clock: immune to wall-clock adjustments
+        self.start_ns = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.start_time:
-            duration_ms = (time.time() - self.start_time) * 1000
+        if self.start_ns is not None:
+            duration_ms = (time.perf_counter_ns() - self.start_ns) / 1_000_000
             self.metrics_collector.record_timer(self.operation_name, duration_ms)
             
             # Log slow operations
-            if duration_ms > config.PERFORMANCE_ALERT_THRESHOLDS['response_time_ms']:
+            if duration_ms > self._threshold:
                 self.logger.warning(
                     f"Slow operation detected: {self.operation_name}",
-                    {'duration_ms': duration_ms, 'threshold_ms': config.PERFORMANCE_ALERT_THRESHOLDS['response_time_ms']}
+                    {'duration_ms': duration_ms, 'threshold_ms': self._threshold}
                 )
 
 
+class NullTimer:
+    """No-op context manager used in place of PerformanceTimer when metrics are disabled"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
 # Global instances
-metrics_collector = MetricsCollector()
+metrics_collector = MetricsCollector() if getattr(config, 'METRICS_ENABLED', True) else NullMetricsCollector()
 logger = StructuredLogger()
+_null_timer = NullTimer()
 
 
 def get_performance_timer(operation_name: str) -> PerformanceTimer:
     """Get a performance timer for an operation"""
+    if isinstance(metrics_collector, NullMetricsCollector):
+        return _null_timer
     return PerformanceTimer(operation_name, metrics_collector, logger)
\ No newline at end of file
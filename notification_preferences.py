@@ -3,14 +3,53 @@ User notification preferences system for BCTC Auction Bot
 Manages customizable notification settings for users
 """
 import aiosqlite
+import asyncio
 import json
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, FrozenSet
 from dataclasses import dataclass, asdict
 
 from config import config
 from monitoring import logger, metrics_collector, get_performance_timer
 
+try:
+    import orjson
+    
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        """Serialize preference settings to UTF-8 JSON bytes"""
+        return json.dumps(obj).encode()
+    
+    _loads = json.loads  # Accepts both bytes and legacy TEXT rows
+
+
+_CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        user_id INTEGER,
+        preference_type TEXT,
+        enabled BOOLEAN DEFAULT 1,
+        settings BLOB,
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL,
+        PRIMARY KEY (user_id, preference_type)
+    )
+"""
+
+# Keeps the original created_at on conflict without a correlated subquery
+_UPSERT_SQL = """
+    INSERT INTO notification_preferences
+    (user_id, preference_type, enabled, settings, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, preference_type) DO UPDATE SET
+        enabled = excluded.enabled,
+        settings = excluded.settings,
+        updated_at = excluded.updated_at
+"""
+
 
 @dataclass
 class NotificationPreference:
@@ -36,69 +75,148 @@ class NotificationPreferencesManager:
     
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._db: Optional[aiosqlite.Connection] = None  # Shared connection, opened in initialize()
+        # Serializes execute -> commit/rollback on the shared connection so writes never interleave
+        self._write_lock = asyncio.Lock()
+        
+        # LRU of user_id -> (expires_at, preferences); invalidated on every write for that user
+        self._pref_cache: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._pref_cache_ttl = 60.0
+        self._pref_cache_max_size = 10000
+        # preference_type -> (expires_at, users who explicitly disabled it); usually tiny, dropped on writes
+        self._opted_out_cache: Dict[str, Tuple[float, FrozenSet[int]]] = {}
         
     async def initialize(self):
-        """Initialize the notification preferences database"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS notification_preferences (
-                    user_id INTEGER,
-                    preference_type TEXT,
-                    enabled BOOLEAN DEFAULT 1,
-                    settings TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    PRIMARY KEY (user_id, preference_type)
-                )
-            """)
-            
-            # Create indexes for better query performance
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_notification_preferences_user_id 
-                ON notification_preferences(user_id)
-            """)
-            
-            await db.commit()
-            logger.info("Notification preferences database initialized")
+        """Open the shared connection and initialize the notification preferences database"""
+        # A larger statement cache keeps this module's hot statements prepared
+        self._db = await aiosqlite.connect(self.db_path, cached_statements=256)
+        
+        # WAL lets readers proceed during writes, and NORMAL sync is safe under WAL
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA synchronous=NORMAL")
+        await self._db.execute("PRAGMA temp_store=MEMORY")
+        await self._db.execute("PRAGMA cache_size=-64000")  # ~64MB page cache
+        
+        await self._db.execute(_CREATE_TABLE_SQL.format(table="notification_preferences"))
+        await self._migrate_timestamps_to_integer()
+        
+        # One-shot migration: settings used to be stored as JSON TEXT
+        await self._db.execute(
+            "UPDATE notification_preferences SET settings = CAST(settings AS BLOB) WHERE typeof(settings) = 'text'"
+        )
+        
+        # Create indexes for better query performance
+        await self._db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notification_preferences_user_id 
+            ON notification_preferences(user_id)
+        """)
+        await self._db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notification_preferences_updated_at 
+            ON notification_preferences(updated_at)
+        """)
+        await self._db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notification_preferences_pref_enabled 
+            ON notification_preferences(preference_type, enabled)
+        """)
+        
+        await self._db.commit()
+        logger.info("Notification preferences database initialized")
+    
+    async def _migrate_timestamps_to_integer(self):
+        """One-shot migration of created_at/updated_at from ISO TEXT to INTEGER unix seconds"""
+        async with self._db.execute("PRAGMA table_info(notification_preferences)") as cursor:
+            column_types = {row[1]: row[2] for row in await cursor.fetchall()}
+        if column_types.get("updated_at", "").upper() == "INTEGER":
+            return
+        
+        # Column affinity can't be altered in place, so rebuild the table in one transaction.
+        # Legacy values were naive local times from datetime.now().isoformat().
+        await self._db.execute("BEGIN")
+        await self._db.execute(_CREATE_TABLE_SQL.format(table="notification_preferences_new"))
+        await self._db.execute("""
+            INSERT INTO notification_preferences_new
+            SELECT user_id, preference_type, enabled, settings,
+                   CAST(strftime('%s', created_at, 'utc') AS INTEGER),
+                   CAST(strftime('%s', updated_at, 'utc') AS INTEGER)
+            FROM notification_preferences
+        """)
+        await self._db.execute("DROP TABLE notification_preferences")
+        await self._db.execute("ALTER TABLE notification_preferences_new RENAME TO notification_preferences")
+        await self._db.commit()
+        logger.info("Migrated notification preference timestamps to INTEGER")
+    
+    async def close(self):
+        """Close the shared database connection"""
+        if self._db:
+            await self._db.close()
+            self._db = None
     
     async def get_user_preferences(self, user_id: int) -> Dict[str, Any]:
         """Get all notification preferences for a user"""
+        cached = self._pref_cache.get(user_id)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self._pref_cache.move_to_end(user_id)
+                metrics_collector.record_counter("notification_preferences_cache_hits")
+                return cached[1].copy()
+            del self._pref_cache[user_id]
+        
         with get_performance_timer("get_user_preferences"):
             try:
-                async with aiosqlite.connect(self.db_path) as db:
-                    async with db.execute(
-                        "SELECT preference_type, enabled, settings FROM notification_preferences WHERE user_id = ?",
-                        (user_id,)
-                    ) as cursor:
-                        rows = await cursor.fetchall()
+                async with self._db.execute(
+                    "SELECT preference_type, enabled, settings FROM notification_preferences WHERE user_id = ?",
+                    (user_id,)
+                ) as cursor:
+                    rows = await cursor.fetchall()
                 
                 # Start with default preferences
                 preferences = config.NOTIFICATION_PREFERENCES_DEFAULT.copy()
                 
                 # Override with user's custom settings
-                for row in rows:
-                    preference_type, enabled, settings_json = row
-                    preferences[preference_type] = enabled
+                preferences.update({preference_type: enabled for preference_type, enabled, _ in rows})
+                
+                # If there are additional settings, merge them; most rows have none
+                with_settings = [(preference_type, blob) for preference_type, _, blob in rows if blob]
+                if with_settings:
+                    # Decode in one pass under a single handler; only a corrupt row pays for the per-row retry
+                    try:
+                        decoded = [_loads(blob) for _, blob in with_settings]
+                    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError both subclass it
+                        decoded = [
+                            self._decode_settings(user_id, preference_type, blob)
+                            for preference_type, blob in with_settings
+                        ]
                     
-                    # If there are additional settings, merge them
-                    if settings_json:
-                        try:
-                            settings = json.loads(settings_json)
-                            if isinstance(settings, dict):
-                                # Merge settings into preference name with underscore
-                                for key, value in settings.items():
-                                    preferences[f"{preference_type}_{key}"] = value
-                        except json.JSONDecodeError:
-                            logger.warning(f"Invalid JSON in notification settings for user {user_id}, preference {preference_type}")
+                    for settings in decoded:
+                        if isinstance(settings, dict):
+                            # Keys are stored already prefixed with the preference name
+                            preferences.update(settings)
                 
                 metrics_collector.record_counter("notification_preferences_retrieved")
-                return preferences
+                self._cache_preferences(user_id, preferences)
+                return preferences.copy()
                 
             except Exception as e:
                 logger.error(f"Failed to get notification preferences for user {user_id}: {e}")
                 metrics_collector.record_counter("notification_preferences_errors")
                 return config.NOTIFICATION_PREFERENCES_DEFAULT.copy()
     
+    @staticmethod
+    def _decode_settings(user_id: int, preference_type: str, settings_blob) -> Optional[Any]:
+        """Decode one settings payload, logging and skipping it if it is invalid"""
+        try:
+            return _loads(settings_blob)
+        except ValueError:
+            logger.warning(f"Invalid JSON in notification settings for user {user_id}, preference {preference_type}")
+            return None
+    
+    def _cache_preferences(self, user_id: int, preferences: Dict[str, Any]):
+        """Store preferences in the LRU cache, evicting the least recently used users"""
+        self._pref_cache[user_id] = (time.monotonic() + self._pref_cache_ttl, preferences)
+        self._pref_cache.move_to_end(user_id)
+        while len(self._pref_cache) > self._pref_cache_max_size:
+            self._pref_cache.popitem(last=False)
+    
     async def update_user_preference(
         self, 
         user_id: int, 
@@ -109,22 +227,23 @@ class NotificationPreferencesManager:
         """Update a specific notification preference for a user"""
         with get_performance_timer("update_user_preference"):
             try:
-                current_time = datetime.now().isoformat()
-                settings_json = json.dumps(settings) if settings else None
+                current_time = int(time.time())
+                # Prefix keys with the preference name once here so reads can merge them directly
+                settings_blob = _dumps(
+                    {f"{preference_type}_{key}": value for key, value in settings.items()}
+                ) if settings else None
                 
-                async with aiosqlite.connect(self.db_path) as db:
-                    await db.execute("""
-                        INSERT OR REPLACE INTO notification_preferences 
-                        (user_id, preference_type, enabled, settings, created_at, updated_at)
-                        VALUES (?, ?, ?, ?, 
-                                COALESCE((SELECT created_at FROM notification_preferences 
-                                         WHERE user_id = ? AND preference_type = ?), ?), 
-                                ?)
-                    """, (
-                        user_id, preference_type, enabled, settings_json,
-                        user_id, preference_type, current_time, current_time
-                    ))
-                    await db.commit()
+                async with self._write_lock:
+                    try:
+                        await self._db.execute(_UPSERT_SQL, (
+                            user_id, preference_type, enabled, settings_blob, current_time, current_time
+                        ))
+                        await self._db.commit()
+                    except Exception:
+                        await self._rollback()
+                        raise
+                self._pref_cache.pop(user_id, None)
+                self._opted_out_cache.pop(preference_type, None)
                 
                 logger.info(
                     f"Updated notification preference for user {user_id}",
@@ -145,24 +264,24 @@ class NotificationPreferencesManager:
         """Update multiple notification preferences for a user"""
         with get_performance_timer("bulk_update_preferences"):
             try:
-                current_time = datetime.now().isoformat()
+                current_time = int(time.time())
+                rows = [
+                    (user_id, preference_type, enabled, None, current_time, current_time)
+                    for preference_type, enabled in preferences.items()
+                    if preference_type in config.NOTIFICATION_PREFERENCES_DEFAULT
+                ]
                 
-                async with aiosqlite.connect(self.db_path) as db:
-                    for preference_type, enabled in preferences.items():
-                        if preference_type in config.NOTIFICATION_PREFERENCES_DEFAULT:
-                            await db.execute("""
-                                INSERT OR REPLACE INTO notification_preferences 
-                                (user_id, preference_type, enabled, settings, created_at, updated_at)
-                                VALUES (?, ?, ?, NULL, 
-                                        COALESCE((SELECT created_at FROM notification_preferences 
-                                                 WHERE user_id = ? AND preference_type = ?), ?), 
-                                        ?)
-                            """, (
-                                user_id, preference_type, enabled,
-                                user_id, preference_type, current_time, current_time
-                            ))
-                    
-                    await db.commit()
+                # One statement for all rows; sqlite3's implicit transaction spans the executemany
+                async with self._write_lock:
+                    try:
+                        await self._db.executemany(_UPSERT_SQL, rows)
+                        await self._db.commit()
+                    except Exception:
+                        await self._rollback()
+                        raise
+                self._pref_cache.pop(user_id, None)
+                for preference_type in preferences:
+                    self._opted_out_cache.pop(preference_type, None)
                 
                 logger.info(f"Bulk updated notification preferences for user {user_id}")
                 metrics_collector.record_counter("notification_preferences_bulk_updated")
@@ -173,23 +292,47 @@ class NotificationPreferencesManager:
                 metrics_collector.record_counter("notification_preferences_bulk_update_errors")
                 return False
     
+    async def _rollback(self):
+        """Roll back a failed write so the shared connection isn't left inside a transaction"""
+        # Only called with _write_lock held, so the open transaction is the failed write's own
+        if self._db and self._db.in_transaction:
+            await self._db.rollback()
+    
     async def should_send_notification(self, user_id: int, notification_type: str) -> bool:
         """Check if a notification should be sent to a user"""
         preferences = await self.get_user_preferences(user_id)
         return preferences.get(notification_type, True)  # Default to True if not found
     
+    async def get_opted_out_users(self, preference_type: str) -> FrozenSet[int]:
+        """
+        Get the users who explicitly disabled a preference, cached like user preferences
+        
+        Raises on database errors so a failed read is never cached as "nobody opted out"
+        """
+        cached = self._opted_out_cache.get(preference_type)
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
+        opted_out = frozenset(await self._query_users_with_preference(preference_type, enabled=False))
+        self._opted_out_cache[preference_type] = (now + self._pref_cache_ttl, opted_out)
+        return opted_out
+    
+    async def _query_users_with_preference(self, preference_type: str, enabled: bool) -> List[int]:
+        """Query users with a preference enabled/disabled, letting database errors propagate"""
+        async with self._db.execute(
+            "SELECT user_id FROM notification_preferences WHERE preference_type = ? AND enabled = ?",
+            (preference_type, enabled)
+        ) as cursor:
+            rows = await cursor.fetchall()
+        
+        return [row[0] for row in rows]
+    
     async def get_users_with_preference(self, preference_type: str, enabled: bool = True) -> List[int]:
         """Get all users who have a specific preference enabled/disabled"""
         with get_performance_timer("get_users_with_preference"):
             try:
-                async with aiosqlite.connect(self.db_path) as db:
-                    async with db.execute(
-                        "SELECT user_id FROM notification_preferences WHERE preference_type = ? AND enabled = ?",
-                        (preference_type, enabled)
-                    ) as cursor:
-                        rows = await cursor.fetchall()
-                
-                return [row[0] for row in rows]
+                return await self._query_users_with_preference(preference_type, enabled)
                 
             except Exception as e:
                 logger.error(f"Failed to get users with preference {preference_type}: {e}")
@@ -198,17 +341,24 @@ class NotificationPreferencesManager:
     async def cleanup_old_preferences(self, days_old: int = 90) -> int:
         """Clean up old, unused notification preferences"""
         try:
-            cutoff_date = (datetime.now() - timedelta(days=days_old)).isoformat()
+            cutoff = int(time.time()) - days_old * 86400
             
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(
-                    "DELETE FROM notification_preferences WHERE updated_at < ?",
-                    (cutoff_date,)
-                )
-                deleted_count = cursor.rowcount
-                await db.commit()
+            async with self._write_lock:
+                try:
+                    cursor = await self._db.execute(
+                        "DELETE FROM notification_preferences WHERE updated_at < ?",
+                        (cutoff,)
+                    )
+                    deleted_count = cursor.rowcount
+                    await self._db.commit()
+                except Exception:
+                    await self._rollback()
+                    raise
             
             if deleted_count > 0:
+                # Deleted rows fall back to defaults, so cached entries may be stale
+                self._pref_cache.clear()
+                self._opted_out_cache.clear()
                 logger.info(f"Cleaned up {deleted_count} old notification preferences")
                 metrics_collector.record_counter("notification_preferences_cleaned", deleted_count)
             
@@ -225,38 +375,57 @@ class NotificationScheduler:
     def __init__(self, preferences_manager: NotificationPreferencesManager):
         self.preferences_manager = preferences_manager
         self.pending_notifications: List[Dict[str, Any]] = []
+        # Bounds concurrent DM sends so they overlap without tripping Discord rate limits
+        self._send_semaphore = asyncio.Semaphore(10)
         
     async def schedule_auction_ending_warnings(self, auction_manager, notification_service):
         """Schedule warnings for auctions ending soon"""
         try:
-            active_auctions = await auction_manager.get_active_auctions(limit=100)
+            # Send an ending warning when 30-60 minutes remain
             current_time = datetime.now()
+            ending_auctions = await auction_manager.get_auctions_ending_between(
+                current_time + timedelta(minutes=30),
+                current_time + timedelta(minutes=60)
+            )
+            if not ending_auctions:
+                return
             
-            for auction in active_auctions:
-                time_remaining = auction.end_time - current_time
-                minutes_remaining = time_remaining.total_seconds() / 60
-                
-                # Check if we should send an ending warning
-                if 30 <= minutes_remaining <= 60:  # 30-60 minutes remaining
-                    await self._send_auction_ending_warning(auction, notification_service)
+            # Warnings default to on, so only the few users who turned them off need checking
+            opted_out = await self.preferences_manager.get_opted_out_users('auction_ending_warning')
+            
+            await asyncio.gather(*(
+                self._send_auction_ending_warning(auction, notification_service, opted_out)
+                for auction in ending_auctions
+            ))
                     
         except Exception as e:
             logger.error(f"Failed to schedule auction ending warnings: {e}")
     
-    async def _send_auction_ending_warning(self, auction, notification_service):
+    async def _send_auction_ending_warning(
+        self,
+        auction,
+        notification_service,
+        opted_out: Optional[FrozenSet[int]] = None
+    ):
         """Send auction ending warning to interested users"""
         try:
+            if opted_out is None:
+                opted_out = await self.preferences_manager.get_opted_out_users('auction_ending_warning')
+            
+            recipients = []
+            
             # Check seller preference
-            seller_preferences = await self.preferences_manager.get_user_preferences(auction.owner_id)
-            if seller_preferences.get('auction_ending_warning', True):
-                # Send warning to seller
-                await notification_service.send_auction_ending_warning(auction, auction.owner_id)
+            if auction.owner_id not in opted_out:
+                recipients.append(auction.owner_id)
             
             # Check current bidder preference (if any)
-            if auction.current_bidder_id:
-                bidder_preferences = await self.preferences_manager.get_user_preferences(auction.current_bidder_id)
-                if bidder_preferences.get('auction_ending_warning', True):
-                    await notification_service.send_auction_ending_warning(auction, auction.current_bidder_id)
+            if auction.current_bidder_id and auction.current_bidder_id not in opted_out:
+                recipients.append(auction.current_bidder_id)
+            
+            # One embed for both recipients; the service overlaps the two DM round-trips
+            if recipients:
+                async with self._send_semaphore:
+                    await notification_service.send_ending_warnings_bulk(auction, recipients)
                     
             metrics_collector.record_counter("auction_ending_warnings_sent")
             
@@ -264,15 +433,14 @@ class NotificationScheduler:
             logger.error(f"Failed to send auction ending warning for auction {auction.auction_id}: {e}")
     
     async def notify_bid_outbid(self, auction, previous_bidder_id, notification_service):
-        """Notify user when they've been outbid"""
+        """Notify user when they've been outbid; the notification service coalesces rapid repeats"""
         if not previous_bidder_id:
             return
             
         try:
-            preferences = await self.preferences_manager.get_user_preferences(previous_bidder_id)
-            if preferences.get('bid_outbid_notification', True):
+            opted_out = await self.preferences_manager.get_opted_out_users('bid_outbid_notification')
+            if previous_bidder_id not in opted_out:
                 await notification_service.send_outbid_notification(auction, previous_bidder_id)
-                metrics_collector.record_counter("outbid_notifications_sent")
                 
         except Exception as e:
-            logger.error(f"Failed to send outbid notification: {e}")
\ No newline at end of file
+            logger.error(f"Failed to send outbid notification: {e}")
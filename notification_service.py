@@ -2,29 +2,165 @@
 Notification service module for BCTC Auction Bot
 Handles auction end notifications, messaging, and pinned auction lists
 """
+import asyncio
+import time
 import discord
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple, Set, Callable, Awaitable
 from auction_manager import Auction
 from monitoring import logger, metrics_collector, get_performance_timer
 from config import config
 
 
+# Maximum number of users kept in the User / DMChannel caches, and how long entries stay valid
+_USER_CACHE_SIZE = 1024
+_USER_CACHE_TTL = 3600.0
+
+# The auction list shows this many auctions, soonest-ending first
+_AUCTION_LIST_SIZE = 10
+# While the list is unchanged, confirm this often (seconds) that its message still exists
+_LIST_RECHECK_INTERVAL = 600.0
+
+# Static title/color scaffolds merged into each embed payload. They must never hold
+# fields or footer: Embed.from_dict keeps references to those instead of copying them.
+_END_EMBED_WIN = {"title": "🔨 Auction Ended", "color": 0x00ff00}
+_END_EMBED_LOSS = {"title": "🔨 Auction Ended", "color": 0xff6b6b}
+_CREATED_EMBED = {"title": "🆕 New Auction Created", "color": 0x00d4aa}
+_AUCTION_LIST_EMBED = {
+    "title": "📋 Active Auctions List",
+    "description": "Live auction status",
+    "color": 0x0099ff
+}
+_SELLER_DM_EMBED_WIN = {"title": "📧 Your Auction Has Ended", "color": 0x00ff00}
+_SELLER_DM_EMBED_LOSS = {"title": "📧 Your Auction Has Ended", "color": 0xff6b6b}
+_BUYER_DM_EMBED = {"title": "🎉 Congratulations! You Won the Auction", "color": 0x00ff00}
+_ENDING_WARNING_EMBED = {"title": "⏰ Auction Ending Soon!", "color": 0xffaa00}
+_OUTBID_EMBED = {"title": "💔 You've Been Outbid!", "color": 0xff6b6b}
+
+# Field names for the embed builders, in display order
+_END_FIELDS = ("📦 Item", "💰 Final Price", "👤 Seller")
+_END_SOLD_FIELDS = ("🏆 Winner", "📈 Status")
+_CREATED_FIELDS = ("📦 Item", "🔢 Quantity", "👤 Seller")
+_CREATED_TIMING_FIELDS = ("⏰ Ends", "⏱️ Duration")
+_BUYER_DM_FIELDS = ("💰 Your Winning Bid", "👤 Seller")
+_ENDING_WARNING_FIELDS = ("📦 Item", "💰 Current Bid", "⏰ Time Left")
+_OUTBID_FIELDS = ("📦 Item", "💰 New High Bid", "⏰ Time Left", "💡 Minimum Bid")
+
+
+def _inline_fields(names, values) -> List[Dict[str, Any]]:
+    """Build inline embed field dicts for Embed.from_dict"""
+    return [{"name": name, "value": value, "inline": True} for name, value in zip(names, values)]
+
+
+class OutbidBatcher:
+    """Coalesces outbid notifications per (user, auction) and sends them in per-auction batches"""
+    
+    def __init__(
+        self,
+        send: Callable[[Auction, List[int]], Awaitable[int]],
+        max_queue_time: float = 2.0,
+        max_batch_size: int = 256
+    ):
+        self._send = send
+        self.max_queue_time = max_queue_time
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[str, Set[int]] = {}  # auction_id -> users to notify
+        self._latest: Dict[str, Auction] = {}  # auction_id -> most recent auction state
+        self._pending_count = 0
+        self._batch_full = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None  # Task for the currently open queue window
+        self._tasks: Set[asyncio.Task] = set()  # Strong refs so in-flight flushes aren't garbage collected
+    
+    def process(self, user_id: int, auction: Auction):
+        """Queue an outbid notification; a newer one for the same user and auction replaces it"""
+        user_ids = self._pending.setdefault(auction.auction_id, set())
+        if user_id in user_ids:
+            metrics_collector.record_counter("outbid_notifications_coalesced")
+        else:
+            user_ids.add(user_id)
+            self._pending_count += 1
+        self._latest[auction.auction_id] = auction  # Latest auction state wins
+        
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush())
+            self._tasks.add(self._flush_task)
+            self._flush_task.add_done_callback(self._tasks.discard)
+        elif self._pending_count >= self.max_batch_size:
+            self._batch_full.set()
+    
+    async def _flush(self):
+        """Wait out the queue window (or a full batch), then send one bulk DM per auction"""
+        try:
+            await asyncio.wait_for(self._batch_full.wait(), self.max_queue_time)
+        except asyncio.TimeoutError:
+            pass
+        
+        # Detach the batch first so notifications queued while sending start a new window
+        batch, latest = self._pending, self._latest
+        self._pending, self._latest, self._pending_count = {}, {}, 0
+        self._batch_full.clear()
+        self._flush_task = None
+        
+        await asyncio.gather(
+            *(self._send(latest[auction_id], list(user_ids)) for auction_id, user_ids in batch.items()),
+            return_exceptions=True
+        )
+
+
 class NotificationService:
     """Service class for handling notifications"""
     
+    __slots__ = (
+        "bot", "notification_channel_id", "_channel", "_channel_for",
+        "pinned_message_id", "_pinned_message", "_last_fingerprint", "_list_checked_at", "_row_cache",
+        "_user_cache", "_dm_channel_cache", "_dm_semaphore", "_outbid_batcher"
+    )
+    
     def __init__(self, bot: discord.Client, notification_channel_id: Optional[int] = None):
         self.bot = bot
         self.notification_channel_id = notification_channel_id
+        self._channel: Optional[discord.abc.Messageable] = None  # Resolved notification channel
+        self._channel_for: Optional[int] = None  # Channel ID that _channel was resolved for
         self.pinned_message_id: Optional[int] = None  # Store the pinned auction list message ID
+        self._pinned_message: Optional[discord.Message] = None  # Cached so steady-state edits skip fetch_message
+        self._last_fingerprint: Optional[tuple] = None  # Content of the last auction list sent
+        self._list_checked_at = 0.0  # Monotonic time the list message was last known to exist
+        self._row_cache: Dict[tuple, str] = {}  # Formatted auction list rows, keyed by their visible content
+        # LRU caches so repeat DM recipients skip fetch_user and DM channel creation
+        self._user_cache: "OrderedDict[int, Tuple[float, discord.User]]" = OrderedDict()
+        self._dm_channel_cache: "OrderedDict[int, Tuple[float, discord.DMChannel]]" = OrderedDict()
+        # Caps concurrent DM sends for the bulk senders (the outbid batcher flushes through them)
+        self._dm_semaphore = asyncio.Semaphore(64)
+        self._outbid_batcher = OutbidBatcher(self.send_outbid_bulk)
+    
+    def _get_channel(self) -> Optional[discord.abc.Messageable]:
+        """Resolve the notification channel, reusing the last lookup while the channel ID is unchanged"""
+        if not self.notification_channel_id:
+            return None
+        if self._channel is not None and self._channel_for == self.notification_channel_id:
+            return self._channel
+        
+        channel = self.bot.get_channel(self.notification_channel_id)
+        if not isinstance(channel, discord.abc.Messageable):
+            return None
+        
+        self._channel = channel
+        self._channel_for = self.notification_channel_id
+        return channel
     
     async def send_auction_end_notification(self, auction_data: Dict[str, Any]) -> bool:
         """Send notification when an auction ends"""
         try:
-            # Send public notification
-            public_sent = await self._send_public_auction_end_notification(auction_data)
-            
-            # Send DM notifications
-            await self._send_dm_notifications_for_auction_end(auction_data)
+            # One timestamp and one set of formatted strings shared by the public and DM embeds
+            now = discord.utils.utcnow()
+            ctx = self._end_context(auction_data)
+            
+            # Send public notification and DM notifications concurrently
+            public_sent, _ = await asyncio.gather(
+                self._send_public_auction_end_notification(auction_data, now, ctx),
+                self._send_dm_notifications_for_auction_end(auction_data, now, ctx)
+            )
             
             return public_sent
             
@@ -32,19 +168,36 @@ class NotificationService:
             logger.error(f"Error in auction end notification process: {e}")
             return False
     
-    async def _send_public_auction_end_notification(self, auction_data: Dict[str, Any]) -> bool:
+    @staticmethod
+    def _end_context(auction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Format the values shared by every auction end embed once"""
+        final_price = auction_data.get('current_bid', 0)
+        bidder_id = auction_data.get('current_bidder_id')
+        return {
+            "item_name": auction_data.get('item_name', 'Unknown Item'),
+            "auction_id": auction_data.get('auction_id', 'Unknown'),
+            "has_winner": final_price > 0,
+            "final_price_str": f"${final_price:.2f}",
+            "seller_mention": f"<@{auction_data.get('owner_id', 0)}>",
+            "buyer_mention": f"<@{bidder_id}>" if bidder_id else None
+        }
+    
+    async def _send_public_auction_end_notification(
+        self, auction_data: Dict[str, Any], now: Optional[datetime] = None,
+        ctx: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """Send public notification to the notification channel"""
         try:
             if not self.notification_channel_id:
                 logger.warning("No notification channel configured, skipping notification")
                 return False
                 
-            channel = self.bot.get_channel(self.notification_channel_id)
-            if not channel or not hasattr(channel, 'send'):
+            channel = self._get_channel()
+            if channel is None:
                 logger.error(f"Notification channel not found or invalid: {self.notification_channel_id}")
                 return False
             
-            embed = self._create_auction_end_embed(auction_data)
+            embed = self._create_auction_end_embed(auction_data, now, ctx)
             await channel.send(embed=embed)
             
             logger.info(f"Auction end notification sent for: {auction_data.get('item_name', 'Unknown Item')}")
@@ -54,21 +207,28 @@ class NotificationService:
             logger.error(f"Error sending public auction end notification: {e}")
             return False
     
-    async def _send_dm_notifications_for_auction_end(self, auction_data: Dict[str, Any]):
+    async def _send_dm_notifications_for_auction_end(
+        self, auction_data: Dict[str, Any], now: Optional[datetime] = None,
+        ctx: Optional[Dict[str, Any]] = None
+    ):
         """Send DM notifications to seller and buyer"""
         try:
             seller_id = auction_data.get('owner_id')
             buyer_id = auction_data.get('current_bidder_id')
+            sends = []
             
             # Send notification to seller
             if seller_id:
-                seller_embed = self._create_seller_dm_embed(auction_data)
-                await self.send_dm_notification(seller_id, seller_embed)
+                seller_embed = self._create_seller_dm_embed(auction_data, now, ctx)
+                sends.append(self.send_dm_notification(seller_id, seller_embed))
             
             # Send notification to buyer (if there was one)
             if buyer_id and buyer_id != seller_id:
-                buyer_embed = self._create_buyer_dm_embed(auction_data)
-                await self.send_dm_notification(buyer_id, buyer_embed)
+                buyer_embed = self._create_buyer_dm_embed(auction_data, now, ctx)
+                sends.append(self.send_dm_notification(buyer_id, buyer_embed))
+            
+            # The DMs are independent, so overlap their round-trips
+            await asyncio.gather(*sends, return_exceptions=True)
                 
         except Exception as e:
             logger.error(f"Error sending DM notifications: {e}")
@@ -84,11 +244,9 @@ class NotificationService:
             bool: True if notification was sent successfully
         """
         try:
-            if not self.notification_channel_id:
-                return False
-                
-            channel = self.bot.get_channel(self.notification_channel_id)
-            if not channel or not hasattr(channel, 'send'):
+            # Checked before any embed is built; also covers an unset channel ID
+            channel = self._get_channel()
+            if channel is None:
                 return False
             
             embed = self._create_auction_created_embed(auction)
@@ -101,147 +259,212 @@ class NotificationService:
             logger.error(f"Error sending auction created notification: {e}")
             return False
     
-    def _create_auction_end_embed(self, auction_data: Dict[str, Any]) -> discord.Embed:
+    def _create_auction_end_embed(
+        self, auction_data: Dict[str, Any], now: Optional[datetime] = None,
+        ctx: Optional[Dict[str, Any]] = None
+    ) -> discord.Embed:
         """Create embed for auction end notification"""
-        has_winner = auction_data.get('current_bid', 0) > 0
-        
-        embed = discord.Embed(
-            title="🔨 Auction Ended",
-            description=f"**{auction_data.get('item_name', 'Unknown Item')}** auction has ended!",
-            color=0x00ff00 if has_winner else 0xff6b6b
-        )
+        ctx = ctx or self._end_context(auction_data)
+        item_name = ctx["item_name"]
+        has_winner = ctx["has_winner"]
+        buyer_mention = ctx["buyer_mention"]
         
         # Add auction details
-        embed.add_field(
-            name="📦 Item", 
-            value=auction_data.get('item_name', 'Unknown'), 
-            inline=True
-        )
-        
-        final_price = auction_data.get('current_bid', 0)
-        embed.add_field(
-            name="💰 Final Price", 
-            value=f"${final_price:.2f}" if final_price > 0 else "No bids", 
-            inline=True
-        )
-        
-        embed.add_field(
-            name="👤 Seller", 
-            value=f"<@{auction_data.get('owner_id', 0)}>", 
-            inline=True
-        )
+        fields = _inline_fields(_END_FIELDS, (
+            item_name,
+            ctx["final_price_str"] if has_winner else "No bids",
+            ctx["seller_mention"]
+        ))
         
         # Add winner if there was a bid
-        if auction_data.get('current_bidder_id'):
-            embed.add_field(
-                name="🏆 Winner", 
-                value=f"<@{auction_data.get('current_bidder_id')}>", 
-                inline=True
-            )
-            embed.add_field(name="📈 Status", value="**SOLD**", inline=True)
+        if buyer_mention:
+            fields.extend(_inline_fields(_END_SOLD_FIELDS, (buyer_mention, "**SOLD**")))
         else:
-            embed.add_field(name="📈 Status", value="**UNSOLD**", inline=True)
+            fields.append({"name": "📈 Status", "value": "**UNSOLD**", "inline": True})
+        
+        embed = discord.Embed.from_dict({
+            **(_END_EMBED_WIN if has_winner else _END_EMBED_LOSS),
+            "description": f"**{item_name}** auction has ended!",
+            "fields": fields,
+            "footer": {"text": f"Auction ID: {ctx['auction_id']}"}
+        })
         
         # Add timestamp
-        embed.timestamp = discord.utils.utcnow()
-        embed.set_footer(text=f"Auction ID: {auction_data.get('auction_id', 'Unknown')}")
+        embed.timestamp = now or discord.utils.utcnow()
         
         return embed
     
     def _create_auction_created_embed(self, auction: Auction) -> discord.Embed:
         """Create embed for new auction notification"""
-        embed = discord.Embed(
-            title="🆕 New Auction Created",
-            description=f"**{auction.auction_name}** is now live!",
-            color=0x00d4aa
-        )
-        
-        embed.add_field(name="📦 Item", value=auction.item_name, inline=True)
-        embed.add_field(name="🔢 Quantity", value=str(auction.quantity), inline=True)
-        embed.add_field(name="👤 Seller", value=f"<@{auction.owner_id}>", inline=True)
+        fields = _inline_fields(_CREATED_FIELDS, (
+            auction.item_name,
+            str(auction.quantity),
+            f"<@{auction.owner_id}>"
+        ))
         
         if auction.bin_price:
-            embed.add_field(name="🎯 BIN Price", value=f"${auction.bin_price:.2f}", inline=True)
+            fields.append({"name": "🎯 BIN Price", "value": f"${auction.bin_price:.2f}", "inline": True})
         
-        embed.add_field(
-            name="⏰ Ends", 
-            value=f"<t:{int(auction.end_time.timestamp())}:R>", 
-            inline=True
-        )
-        
-        embed.add_field(
-            name="⏱️ Duration", 
-            value=f"{auction.duration_hours} hours", 
-            inline=True
-        )
+        fields.extend(_inline_fields(_CREATED_TIMING_FIELDS, (
+            auction.end_relative_str,
+            f"{auction.duration_hours} hours"
+        )))
         
         if auction.description:
-            embed.add_field(name="📝 Description", value=auction.description, inline=False)
+            fields.append({"name": "📝 Description", "value": auction.description, "inline": False})
+        
+        payload = {
+            **_CREATED_EMBED,
+            "description": f"**{auction.auction_name}** is now live!",
+            "fields": fields,
+            "footer": {"text": f"Use /auctions to view and bid • ID: {auction.auction_id}"}
+        }
         
         # Add image if provided
         if auction.image_url:
-            embed.set_image(url=auction.image_url)
+            payload["image"] = {"url": auction.image_url}
         
+        embed = discord.Embed.from_dict(payload)
         embed.timestamp = auction.start_time
-        embed.set_footer(text=f"Use /auctions to view and bid • ID: {auction.auction_id}")
         
         return embed
     
     def set_notification_channel(self, channel_id: int):
         """Update the notification channel ID"""
         self.notification_channel_id = channel_id
+        self._channel = None
+        self._last_fingerprint = None
     
     async def send_dm_notification(self, user_id: int, embed: discord.Embed) -> bool:
         """Send a DM notification to a user"""
         try:
-            user = self.bot.get_user(user_id)
-            if not user:
-                user = await self.bot.fetch_user(user_id)
-            
-            await user.send(embed=embed)
-            logger.info(f"DM notification sent to user {user_id}")
+            await self._resolve_and_send(user_id, embed)
+            logger.debug(f"DM notification sent to user {user_id}")
             return True
             
         except discord.Forbidden:
             logger.warning(f"Cannot send DM to user {user_id} - DMs disabled or not mutual")
             return False
         except Exception as e:
+            # Drop cached objects in case they are what went stale
+            self.invalidate_user(user_id)
             logger.error(f"Error sending DM to user {user_id}: {e}")
             return False
     
-    async def update_pinned_auction_list(self, auctions: List[Auction]) -> bool:
-        """Update the auction list message by deleting and re-sending (without pinning)"""
+    async def _resolve_and_send(self, user_id: int, embed: discord.Embed):
+        """Resolve a user's DM channel (cached where possible) and send the embed; raises on failure"""
+        channel = self._lookup(self._dm_channel_cache, user_id)
+        if channel is None:
+            user = await self._get_user(user_id)
+            channel = user.dm_channel or await user.create_dm()
+            self._remember(self._dm_channel_cache, user_id, channel)
+        
+        await channel.send(embed=embed)
+    
+    def invalidate_user(self, user_id: int):
+        """Forget the cached User and DM channel for a user"""
+        self._user_cache.pop(user_id, None)
+        self._dm_channel_cache.pop(user_id, None)
+    
+    async def _get_user(self, user_id: int) -> discord.User:
+        """Resolve a user from the LRU cache, the bot's cache, or the API"""
+        user = self._lookup(self._user_cache, user_id)
+        if user is not None:
+            return user
+        
+        user = self.bot.get_user(user_id)
+        if not user:
+            user = await self.bot.fetch_user(user_id)
+        self._remember(self._user_cache, user_id, user)
+        return user
+    
+    @staticmethod
+    def _lookup(cache: OrderedDict, key: int) -> Optional[Any]:
+        """Get a live entry from a TTL LRU cache, dropping it if it has expired"""
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return entry[1]
+    
+    @staticmethod
+    def _remember(cache: OrderedDict, key: int, value: Any):
+        """Insert into a bounded TTL LRU cache, evicting the least recently used entry"""
+        cache[key] = (time.monotonic() + _USER_CACHE_TTL, value)
+        cache.move_to_end(key)
+        if len(cache) > _USER_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    async def update_pinned_auction_list(self, auctions: List[Auction], total: Optional[int] = None) -> bool:
+        """
+        Update the auction list message in place, sending a new one if it is gone (without pinning)
+        
+        Args:
+            auctions: Active auctions ordered soonest-ending first (as get_soonest_ending_auctions returns them)
+            total: Number of active auctions overall, if `auctions` is only a subset
+        """
         try:
-            if not self.notification_channel_id:
-                return False
-                
-            channel = self.bot.get_channel(self.notification_channel_id)
-            if not channel or not hasattr(channel, 'send'):
+            channel = self._get_channel()
+            if channel is None:
                 return False
             
-            embed = self._create_pinned_auction_list_embed(auctions)
+            # The list is already ordered, so the visible rows are just its head
+            if total is None:
+                total = len(auctions)
+            top_auctions = auctions[:_AUCTION_LIST_SIZE]
+            
+            # Skip the API call entirely when the visible list hasn't changed
+            fingerprint = (total,) + tuple(
+                (a.auction_id, a.auction_name, a.item_name, a.current_bid, a.bin_price, a.end_time)
+                for a in top_auctions
+            )
+            if self.pinned_message_id and fingerprint == self._last_fingerprint:
+                if time.monotonic() - self._list_checked_at < _LIST_RECHECK_INTERVAL:
+                    return True
+                # Unchanged for a while; make sure nobody deleted the message in the meantime
+                try:
+                    self._pinned_message = await channel.fetch_message(self.pinned_message_id)
+                    self._list_checked_at = time.monotonic()
+                    return True
+                except discord.NotFound:
+                    # Deleted while idle, recreate it below
+                    self.pinned_message_id = None
+                    self._pinned_message = None
             
-            # Delete existing message if it exists
+            embed = self._create_pinned_auction_list_embed(top_auctions, total)
+            
+            # Edit the existing message in place if it still exists
             if self.pinned_message_id:
                 try:
-                    old_message = await channel.fetch_message(self.pinned_message_id)
-                    await old_message.delete()
-                    logger.info(f"Deleted old auction list message: {self.pinned_message_id}")
+                    message = self._pinned_message
+                    if message is None or message.id != self.pinned_message_id:
+                        message = await channel.fetch_message(self.pinned_message_id)
+                    self._pinned_message = await message.edit(embed=embed)
+                    self._last_fingerprint = fingerprint
+                    self._list_checked_at = time.monotonic()
+                    return True
                 except discord.NotFound:
-                    # Message was already deleted, that's fine
+                    # Message was deleted, send a new one below
                     pass
                 except Exception as e:
-                    logger.warning(f"Error deleting old message: {e}")
+                    logger.warning(f"Error editing auction list message: {e}")
                     # Continue anyway, we'll create a new one
                 
-                # Reset the stored message ID
+                # Reset the stored message
                 self.pinned_message_id = None
+                self._pinned_message = None
             
             # Create new message (without pinning)
             message = await channel.send(embed=embed)
             
-            # Store the message ID for future deletion
+            # Store the message for future edits
             self.pinned_message_id = message.id
+            self._pinned_message = message
+            self._last_fingerprint = fingerprint
+            self._list_checked_at = time.monotonic()
             logger.info(f"Created new auction list message: {message.id}")
             return True
                 
@@ -249,145 +472,179 @@ class NotificationService:
             logger.error(f"Error updating auction list: {e}")
             return False
     
-    def _create_pinned_auction_list_embed(self, auctions: List[Auction]) -> discord.Embed:
-        """Create embed for auction list (no buttons)"""
-        embed = discord.Embed(
-            title="📋 Active Auctions List",
-            description="Live auction status (updates every minute)",
-            color=0x0099ff
-        )
+    def _create_pinned_auction_list_embed(self, auctions: List[Auction], total: Optional[int] = None) -> discord.Embed:
+        """Create embed for auction list (no buttons) from the already ordered and trimmed rows to show"""
+        if total is None:
+            total = len(auctions)
         
         if not auctions:
-            embed.add_field(
-                name="No Active Auctions", 
-                value="Use `/create` to start an auction!", 
-                inline=False
-            )
-            embed.set_footer(text="🔄 Updates automatically")
-            return embed
-        
-        # Sort auctions by time remaining (soonest first)
-        sorted_auctions = sorted(auctions, key=lambda a: a.end_time)
+            return discord.Embed.from_dict({
+                **_AUCTION_LIST_EMBED,
+                "fields": [{
+                    "name": "No Active Auctions",
+                    "value": "Use `/create` to start an auction!",
+                    "inline": False
+                }],
+                "footer": {"text": "🔄 Updates automatically"}
+            })
+        
+        row_cache: Dict[tuple, str] = {}
+        auction_list = "\n\n".join(
+            self._format_row(position, auction, row_cache)
+            for position, auction in enumerate(auctions, 1)
+        )
         
-        auction_lines = []
-        for i, auction in enumerate(sorted_auctions[:10]):  # Limit to 10 auctions
-            time_left = auction.time_remaining()
+        # Keep only rows still on the list so ended or changed auctions don't accumulate
+        self._row_cache = row_cache
+        
+        fields = [{
+            "name": f"📋 {total} Active Auction{'s' if total != 1 else ''}",
+            "value": auction_list,
+            "inline": False
+        }]
+        
+        if total > _AUCTION_LIST_SIZE:
+            fields.append({
+                "name": "📝 Note",
+                "value": f"Showing first {_AUCTION_LIST_SIZE} of {total} auctions. Use `/auctions` to see all.",
+                "inline": False
+            })
+        
+        return discord.Embed.from_dict({
+            **_AUCTION_LIST_EMBED,
+            "fields": fields,
+            "footer": {
+                "text": "🔄 Updates automatically | Use /auctions to bid"
+            }
+        })
+    
+    def _format_row(self, position: int, auction: Auction, row_cache: Dict[tuple, str]) -> str:
+        """Format one auction list row, reusing the cached text while nothing it shows has changed"""
+        key = (
+            auction.auction_id, auction.auction_name, auction.item_name,
+            auction.current_bid, auction.bin_price, auction.end_time
+        )
+        row = self._row_cache.get(key)
+        if row is None:
+            # Discord renders relative timestamps client-side, so the row stays current without re-sending
             current_bid = f"${auction.current_bid:.2f}" if auction.current_bid > 0 else "No bids"
             bin_info = f" | BIN: ${auction.bin_price:.2f}" if auction.bin_price else ""
-            
-            auction_lines.append(
-                f"**{i+1}.** {auction.auction_name}\n"
-                f"└ {auction.item_name} | {current_bid}{bin_info} | {time_left}"
+            row = (
+                f"{auction.auction_name}\n"
+                f"└ {auction.item_name} | {current_bid}{bin_info} | {auction.end_relative_str}"
             )
-        
-        embed.add_field(
-            name=f"📋 {len(sorted_auctions)} Active Auction{'s' if len(sorted_auctions) != 1 else ''}",
-            value="\n\n".join(auction_lines),
-            inline=False
-        )
-        
-        if len(sorted_auctions) > 10:
-            embed.add_field(
-                name="📝 Note", 
-                value=f"Showing first 10 of {len(sorted_auctions)} auctions. Use `/auctions` to see all.",
-                inline=False
-            )
-        
-        embed.set_footer(text=f"🔄 Last updated: {discord.utils.format_dt(discord.utils.utcnow(), 'T')} | Use /auctions to bid | Updates every minute")
-        
-        return embed
+        row_cache[key] = row
+        return f"**{position}.** {row}"
     
-    def _create_seller_dm_embed(self, auction_data: Dict[str, Any]) -> discord.Embed:
+    def _create_seller_dm_embed(
+        self, auction_data: Dict[str, Any], now: Optional[datetime] = None,
+        ctx: Optional[Dict[str, Any]] = None
+    ) -> discord.Embed:
         """Create DM embed for auction seller"""
-        has_winner = auction_data.get('current_bid', 0) > 0
-        
-        embed = discord.Embed(
-            title="📧 Your Auction Has Ended",
-            description=f"Your auction for **{auction_data.get('item_name', 'Unknown Item')}** has concluded!",
-            color=0x00ff00 if has_winner else 0xff6b6b
-        )
-        
-        final_price = auction_data.get('current_bid', 0)
-        embed.add_field(
-            name="💰 Final Sale Price", 
-            value=f"${final_price:.2f}" if final_price > 0 else "No bids received", 
-            inline=True
-        )
-        
-        if auction_data.get('current_bidder_id'):
-            embed.add_field(
-                name="🏆 Winning Buyer", 
-                value=f"<@{auction_data.get('current_bidder_id')}>", 
-                inline=True
-            )
-            embed.add_field(
-                name="📝 Next Steps", 
-                value="Please coordinate with the buyer to complete the trade!", 
-                inline=False
-            )
+        ctx = ctx or self._end_context(auction_data)
+        has_winner = ctx["has_winner"]
+        buyer_mention = ctx["buyer_mention"]
+        
+        fields = [{
+            "name": "💰 Final Sale Price",
+            "value": ctx["final_price_str"] if has_winner else "No bids received",
+            "inline": True
+        }]
+        
+        if buyer_mention:
+            fields.append({"name": "🏆 Winning Buyer", "value": buyer_mention, "inline": True})
+            fields.append({
+                "name": "📝 Next Steps",
+                "value": "Please coordinate with the buyer to complete the trade!",
+                "inline": False
+            })
         else:
-            embed.add_field(
-                name="😢 Result", 
-                value="Your auction ended without any bids. Consider adjusting your pricing or duration for future auctions.", 
-                inline=False
-            )
-        
-        embed.timestamp = discord.utils.utcnow()
-        embed.set_footer(text=f"Auction ID: {auction_data.get('auction_id', 'Unknown')}")
+            fields.append({
+                "name": "😢 Result",
+                "value": "Your auction ended without any bids. Consider adjusting your pricing or duration for future auctions.",
+                "inline": False
+            })
+        
+        embed = discord.Embed.from_dict({
+            **(_SELLER_DM_EMBED_WIN if has_winner else _SELLER_DM_EMBED_LOSS),
+            "description": f"Your auction for **{ctx['item_name']}** has concluded!",
+            "fields": fields,
+            "footer": {"text": f"Auction ID: {ctx['auction_id']}"}
+        })
+        embed.timestamp = now or discord.utils.utcnow()
         
         return embed
     
-    def _create_buyer_dm_embed(self, auction_data: Dict[str, Any]) -> discord.Embed:
+    def _create_buyer_dm_embed(
+        self, auction_data: Dict[str, Any], now: Optional[datetime] = None,
+        ctx: Optional[Dict[str, Any]] = None
+    ) -> discord.Embed:
         """Create DM embed for auction winner"""
-        embed = discord.Embed(
-            title="🎉 Congratulations! You Won the Auction",
-            description=f"You've successfully won the auction for **{auction_data.get('item_name', 'Unknown Item')}**!",
-            color=0x00ff00
-        )
+        ctx = ctx or self._end_context(auction_data)
+        
+        fields = _inline_fields(_BUYER_DM_FIELDS, (ctx["final_price_str"], ctx["seller_mention"]))
+        fields.append({
+            "name": "📝 Next Steps",
+            "value": "Please contact the seller to arrange payment and code delivery. Be sure to follow BCTC trading guidelines!",
+            "inline": False
+        })
+        
+        embed = discord.Embed.from_dict({
+            **_BUYER_DM_EMBED,
+            "description": f"You've successfully won the auction for **{ctx['item_name']}**!",
+            "fields": fields,
+            "footer": {"text": f"Auction ID: {ctx['auction_id']}"}
+        })
+        embed.timestamp = now or discord.utils.utcnow()
         
-        final_price = auction_data.get('current_bid', 0)
-        embed.add_field(
-            name="💰 Your Winning Bid", 
-            value=f"${final_price:.2f}", 
-            inline=True
-        )
+        return embed
+    
+    def _create_ending_warning_embed(self, auction: Auction) -> discord.Embed:
+        """Create DM embed warning that an auction ends within the hour"""
+        fields = _inline_fields(_ENDING_WARNING_FIELDS, (
+            auction.item_name,
+            f"${auction.current_bid:.2f}" if auction.current_bid > 0 else "No bids",
+            auction.time_remaining()
+        ))
         
-        embed.add_field(
-            name="👤 Seller", 
-            value=f"<@{auction_data.get('owner_id', 0)}>", 
-            inline=True
-        )
+        if auction.bin_price:
+            fields.append({"name": "🎯 BIN Price", "value": f"${auction.bin_price:.2f}", "inline": True})
         
-        embed.add_field(
-            name="📝 Next Steps", 
-            value="Please contact the seller to arrange payment and code delivery. Be sure to follow BCTC trading guidelines!", 
-            inline=False
-        )
+        fields.append({"name": "🏁 Ends", "value": auction.end_relative_str, "inline": True})
         
-        embed.timestamp = discord.utils.utcnow()
-        embed.set_footer(text=f"Auction ID: {auction_data.get('auction_id', 'Unknown')}")
+        return discord.Embed.from_dict({
+            **_ENDING_WARNING_EMBED,
+            "description": f"The auction for **{auction.item_name}** is ending in less than 1 hour!",
+            "fields": fields,
+            "footer": {"text": f"Auction ID: {auction.auction_id}"}
+        })
+    
+    def _create_outbid_embed(self, auction: Auction) -> discord.Embed:
+        """Create DM embed telling a user they have been outbid"""
+        min_bid = max(config.MIN_BID_AMOUNT, auction.current_bid * (1 + config.MIN_BID_INCREMENT))
+        fields = _inline_fields(_OUTBID_FIELDS, (
+            auction.item_name,
+            f"${auction.current_bid:.2f}",
+            auction.time_remaining(),
+            f"${min_bid:.2f}"
+        ))
         
-        return embed
+        if auction.bin_price:
+            fields.append({"name": "🎯 BIN Price", "value": f"${auction.bin_price:.2f}", "inline": True})
+        
+        fields.append({"name": "🏁 Ends", "value": auction.end_relative_str, "inline": True})
+        
+        return discord.Embed.from_dict({
+            **_OUTBID_EMBED,
+            "description": f"Someone has placed a higher bid on **{auction.item_name}**.",
+            "fields": fields,
+            "footer": {"text": f"Use /auctions to place a new bid • ID: {auction.auction_id}"}
+        })
     
     async def send_auction_ending_warning(self, auction: Auction, user_id: int) -> bool:
         """Send warning that auction is ending soon"""
         try:
-            embed = discord.Embed(
-                title="⏰ Auction Ending Soon!",
-                description=f"The auction for **{auction.item_name}** is ending in less than 1 hour!",
-                color=0xffaa00
-            )
-            
-            embed.add_field(name="📦 Item", value=auction.item_name, inline=True)
-            embed.add_field(name="💰 Current Bid", value=f"${auction.current_bid:.2f}" if auction.current_bid > 0 else "No bids", inline=True)
-            embed.add_field(name="⏰ Time Left", value=auction.time_remaining(), inline=True)
-            
-            if auction.bin_price:
-                embed.add_field(name="🎯 BIN Price", value=f"${auction.bin_price:.2f}", inline=True)
-            
-            embed.add_field(name="🏁 Ends", value=f"<t:{int(auction.end_time.timestamp())}:R>", inline=True)
-            embed.set_footer(text=f"Auction ID: {auction.auction_id}")
-            
+            embed = self._create_ending_warning_embed(auction)
             await self.send_dm_notification(user_id, embed)
             metrics_collector.record_counter("auction_ending_warnings_sent")
             return True
@@ -397,60 +654,80 @@ class NotificationService:
             return False
     
     async def send_outbid_notification(self, auction: Auction, user_id: int) -> bool:
-        """Send notification when user has been outbid"""
+        """Queue notification that user has been outbid; rapid repeats are coalesced into one DM"""
+        self._outbid_batcher.process(user_id, auction)
+        return True
+    
+    async def send_ending_warnings_bulk(self, auction: Auction, user_ids: List[int]) -> int:
+        """Send the ending warning for one auction to many users; returns how many were delivered"""
         try:
-            embed = discord.Embed(
-                title="💔 You've Been Outbid!",
-                description=f"Someone has placed a higher bid on **{auction.item_name}**.",
-                color=0xff6b6b
-            )
-            
-            embed.add_field(name="📦 Item", value=auction.item_name, inline=True)
-            embed.add_field(name="💰 New High Bid", value=f"${auction.current_bid:.2f}", inline=True)
-            embed.add_field(name="⏰ Time Left", value=auction.time_remaining(), inline=True)
-            
-            min_bid = max(config.MIN_BID_AMOUNT, auction.current_bid * (1 + config.MIN_BID_INCREMENT))
-            embed.add_field(name="💡 Minimum Bid", value=f"${min_bid:.2f}", inline=True)
-            
-            if auction.bin_price:
-                embed.add_field(name="🎯 BIN Price", value=f"${auction.bin_price:.2f}", inline=True)
-            
-            embed.add_field(name="🏁 Ends", value=f"<t:{int(auction.end_time.timestamp())}:R>", inline=True)
-            embed.set_footer(text=f"Use /auctions to place a new bid • ID: {auction.auction_id}")
-            
-            await self.send_dm_notification(user_id, embed)
-            metrics_collector.record_counter("outbid_notifications_sent")
-            return True
-            
+            embed = self._create_ending_warning_embed(auction)
         except Exception as e:
-            logger.error(f"Failed to send outbid notification: {e}")
-            return False
+            logger.error(f"Failed to build auction ending warning: {e}")
+            return 0
+        
+        sent = await self._send_dm_bulk(user_ids, embed)
+        metrics_collector.record_counter("auction_ending_warnings_sent", sent)
+        return sent
+    
+    async def send_outbid_bulk(self, auction: Auction, user_ids: List[int]) -> int:
+        """Send the outbid notification for one auction to many users; returns how many were delivered"""
+        try:
+            embed = self._create_outbid_embed(auction)
+        except Exception as e:
+            logger.error(f"Failed to build outbid notification: {e}")
+            return 0
+        
+        sent = await self._send_dm_bulk(user_ids, embed)
+        metrics_collector.record_counter("outbid_notifications_sent", sent)
+        return sent
+    
+    async def _send_dm_bulk(self, user_ids: List[int], embed: discord.Embed) -> int:
+        """DM the same embed to many users concurrently, bounded by the DM semaphore"""
+        async def send_one(user_id: int):
+            async with self._dm_semaphore:
+                await self._resolve_and_send(user_id, embed)
+        
+        # Each user's lookup and send run as one pipeline; failures come back as results, not raises
+        results = await asyncio.gather(*(send_one(user_id) for user_id in user_ids), return_exceptions=True)
+        
+        sent = 0
+        for user_id, result in zip(user_ids, results):
+            if result is None:
+                sent += 1
+            elif isinstance(result, discord.Forbidden):
+                logger.debug(f"Cannot send DM to user {user_id} - DMs disabled or not mutual")
+                metrics_collector.record_counter("dm_notifications_forbidden")
+            else:
+                self.invalidate_user(user_id)
+                logger.error(f"Error sending DM to user {user_id}: {result}")
+                metrics_collector.record_counter("dm_notification_errors")
+        return sent
     
     async def send_auction_extension_notification(self, auction: Auction, sniping_event) -> bool:
         """Send notification about auction extension due to bid sniping protection"""
         try:
-            if not self.notification_channel_id:
-                return False
-                
-            channel = self.bot.get_channel(self.notification_channel_id)
-            if not channel or not hasattr(channel, 'send'):
+            channel = self._get_channel()
+            if channel is None:
                 return False
             
+            # Read the event and auction once; both embeds share the formatted values
+            item_name = auction.item_name
+            bid_str = f"${sniping_event.bid_amount:.2f}"
+            extension_str = f"+{sniping_event.extension_minutes} minutes"
+            footer = f"Auction ID: {auction.auction_id}"
+            
             embed = discord.Embed(
                 title="🛡️ Auction Extended - Bid Sniping Protection",
-                description=f"Auction for **{auction.item_name}** has been extended!",
+                description=f"Auction for **{item_name}** has been extended!",
                 color=0x0099ff
             )
             
-            embed.add_field(name="📦 Item", value=auction.item_name, inline=True)
-            embed.add_field(name="💰 Current Bid", value=f"${sniping_event.bid_amount:.2f}", inline=True)
+            embed.add_field(name="📦 Item", value=item_name, inline=True)
+            embed.add_field(name="💰 Current Bid", value=bid_str, inline=True)
             embed.add_field(name="👤 Bidder", value=f"<@{sniping_event.bidder_id}>", inline=True)
             
-            embed.add_field(
-                name="⏰ Extension", 
-                value=f"+{sniping_event.extension_minutes} minutes", 
-                inline=True
-            )
+            embed.add_field(name="⏰ Extension", value=extension_str, inline=True)
             
             embed.add_field(
                 name="🕐 Time Remaining", 
@@ -458,21 +735,21 @@ class NotificationService:
                 inline=True
             )
             
-            embed.add_field(name="🏁 New End Time", value=f"<t:{int(auction.end_time.timestamp())}:R>", inline=True)
+            embed.add_field(name="🏁 New End Time", value=auction.end_relative_str, inline=True)
             
-            embed.set_footer(text=f"Auction ID: {auction.auction_id}")
+            embed.set_footer(text=footer)
             
             await channel.send(embed=embed)
             
             # Also send DM to auction owner
             owner_embed = discord.Embed(
                 title="🛡️ Your Auction Has Been Extended",
-                description=f"Your auction for **{auction.item_name}** was extended due to a late bid.",
+                description=f"Your auction for **{item_name}** was extended due to a late bid.",
                 color=0x0099ff
             )
-            owner_embed.add_field(name="💰 New Bid", value=f"${sniping_event.bid_amount:.2f}", inline=True)
-            owner_embed.add_field(name="⏰ Extension", value=f"+{sniping_event.extension_minutes} minutes", inline=True)
-            owner_embed.set_footer(text=f"Auction ID: {auction.auction_id}")
+            owner_embed.add_field(name="💰 New Bid", value=bid_str, inline=True)
+            owner_embed.add_field(name="⏰ Extension", value=extension_str, inline=True)
+            owner_embed.set_footer(text=footer)
             
             await self.send_dm_notification(auction.owner_id, owner_embed)
             
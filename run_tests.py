@@ -2,10 +2,19 @@
 Test runner script for BCTC Auction Bot
 Runs all unit tests and provides coverage report
 """
-import subprocess
 import sys
 import os
 
+def _run_pytest(args):
+    """Run pytest in-process and return its exit code, or None if pytest isn't installed"""
+    try:
+        import pytest
+    except ImportError:
+        print("❌ pytest not found. Install with: pip install pytest pytest-asyncio")
+        return None
+    
+    return int(pytest.main(args))
+
 def run_tests():
     """Run all unit tests"""
     print("🧪 BCTC Auction Bot - Unit Tests")
@@ -17,25 +26,23 @@ def run_tests():
     
     try:
         # Run pytest with verbose output
-        result = subprocess.run([
-            sys.executable, "-m", "pytest",
+        returncode = _run_pytest([
             "tests/",
             "-v",
             "--tb=short",
             "--durations=10"
-        ], capture_output=False, text=True)
+        ])
+        if returncode is None:
+            return False
         
         print("\n" + "=" * 40)
-        if result.returncode == 0:
+        if returncode == 0:
             print("✅ All tests passed!")
         else:
             print("❌ Some tests failed.")
             
-        return result.returncode == 0
+        return returncode == 0
         
-    except FileNotFoundError:
-        print("❌ pytest not found. Install with: pip install pytest pytest-asyncio")
-        return False
     except Exception as e:
         print(f"❌ Error running tests: {e}")
         return False
@@ -43,13 +50,7 @@ def run_tests():
 def run_specific_test(test_file):
     """Run a specific test file"""
     try:
-        result = subprocess.run([
-            sys.executable, "-m", "pytest",
-            f"tests/{test_file}",
-            "-v"
-        ], capture_output=False, text=True)
-        
-        return result.returncode == 0
+        return _run_pytest([f"tests/{test_file}", "-v"]) == 0
         
     except Exception as e:
         print(f"❌ Error running {test_file}: {e}")
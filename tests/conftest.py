@@ -6,44 +6,46 @@ import pytest_asyncio
 import asyncio
 import sys
 import os
-import tempfile
+import aiosqlite
 from unittest.mock import AsyncMock, MagicMock
-from auction_manager import AuctionManager
+
+try:
+    import uvloop
+except ImportError:  # Optional test speedup; not installed, or on Windows
+    uvloop = None
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+from auction_manager import AuctionManager
 
-@pytest_asyncio.fixture
-async def auction_manager():
-    """Create initialized auction manager for tests"""
-    # Use a temporary file instead of :memory: to avoid isolation issues
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tmp:
-        db_path = tmp.name
+def pytest_configure(config):
+    """Import the bot modules once at startup instead of on first use inside a test"""
+    import notification_service, bot_events, config as bot_config  # noqa: F401
     
-    try:
-        manager = AuctionManager(db_path)
-        await manager.initialize()
-        yield manager
-    finally:
-        # Clean up
-        try:
-            os.unlink(db_path)
-        except (OSError, FileNotFoundError):
-            pass
+    # uvloop has cheaper task scheduling; fall back to the stock loop where it is unavailable
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+# Shared-cache in-memory database, visible to every connection the manager opens
+TEST_DB_URI = "file:auction_test?mode=memory&cache=shared"
+
+@pytest_asyncio.fixture(scope="session")
+async def shared_auction_db():
+    """Keep the shared in-memory database alive and create its schema once per session"""
+    # The database is dropped when its last connection closes, so hold one open
+    keeper = await aiosqlite.connect(TEST_DB_URI, uri=True)
+    await AuctionManager(TEST_DB_URI).initialize()
+    yield keeper
+    await keeper.close()
+
+@pytest_asyncio.fixture
+async def auction_manager(shared_auction_db):
+    """Create initialized auction manager for tests"""
+    yield AuctionManager(TEST_DB_URI)
+    # Every manager call commits on its own connection, so reset by clearing the table
+    await shared_auction_db.execute("DELETE FROM auctions")
+    await shared_auction_db.commit()
 
 @pytest.fixture
 def mock_bot():